@@ -0,0 +1,72 @@
+// Front end of the LogViewWidget defined in widgets.py.
+//
+// The kernel sends the whole log in a "reset" message when the view asks for a
+// snapshot, and afterwards "append" messages with only the new lines and the number
+// of old lines to drop. Every appended chunk becomes a text node of its own, so that
+// the cost of an update depends on the appended text, not on the length of the log.
+// The view follows the end of the log, unless it has been scrolled up.
+
+function render({ model, el }) {
+  const description = document.createElement("label");
+  description.className = "log-view-description";
+  const text = document.createElement("pre");
+  text.className = "log-view-text";
+  el.classList.add("log-view");
+  el.append(description, text);
+
+  function renderLabels() {
+    description.textContent = model.get("description");
+    text.dataset.placeholder = model.get("placeholder");
+  }
+
+  function dropLines(count) {
+    while (count > 0 && text.firstChild) {
+      const node = text.firstChild;
+      let start = 0;
+      while (count > 0) {
+        const end = node.data.indexOf("\n", start);
+        if (end < 0) {
+          start = node.data.length;
+          break;
+        }
+        start = end + 1;
+        count -= 1;
+      }
+      if (start >= node.data.length) {
+        node.remove();
+      } else {
+        node.deleteData(0, start);
+      }
+    }
+  }
+
+  function onMessage(content) {
+    const atEnd = text.scrollHeight - text.scrollTop - text.clientHeight < 2;
+    if (content.type === "reset") {
+      text.replaceChildren();
+    } else {
+      dropLines(content.drop);
+    }
+    if (content.text) {
+      text.appendChild(document.createTextNode(content.text));
+    }
+    if (atEnd) {
+      text.scrollTop = text.scrollHeight;
+    }
+  }
+
+  model.on("msg:custom", onMessage);
+  model.on("change:description", renderLabels);
+  model.on("change:placeholder", renderLabels);
+
+  renderLabels();
+  model.send({ type: "snapshot" });
+
+  return () => {
+    model.off("msg:custom", onMessage);
+    model.off("change:description", renderLabels);
+    model.off("change:placeholder", renderLabels);
+  };
+}
+
+export default { render };
@@ -2,8 +2,16 @@
 
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import copy
+import csv
+import datetime
+import heapq
 import inspect
+import json
 import os
+import pathlib
 import re
 import sys
 import threading
@@ -13,23 +21,43 @@ import uuid
 import warnings
 from collections.abc import Mapping
 
+import anywidget
 import ipywidgets as ipw
+import sqlalchemy as sa
 import traitlets as tl
 
 # AiiDA imports
-from aiida import common, orm
+from aiida import common, get_profile, orm
 from aiida.cmdline.utils.ascii_vis import format_call_graph
 from aiida.cmdline.utils.common import (
     get_calcjob_report,
     get_process_function_report,
     get_workchain_report,
 )
+from aiida.common import timezone
 from aiida.common.links import LinkType
+from aiida.common.utils import str_timedelta
+from aiida.manage import get_config, get_manager
 from aiida.tools.query.calculation import CalculationQueryBuilder
-from IPython.display import HTML, Javascript, clear_output, display
+from IPython.display import clear_output, display
 from jinja2 import Template
+from kiwipy import communications
+from plumpy.futures import unwrap_kiwi_future
 
 from home.node_preview import render_node_preview
+from home.process_regex import (
+    description_like_filters,
+    matches_description,
+    regex_in_database,
+    remaining_description_regex,
+)
+from home.process_statistics import (
+    TERMINATED_PROCESS_STATES,
+    ProcessStatisticsWidget,
+    ProcessThroughputWidget,
+)
+from home.tail import FileTail, FileWatcher, RemoteFileTail
+from home.widgets import AutoupdateScheduler, LogViewWidget, PageVisibilityWidget
 
 
 class CantRegisterCallbackError(Exception):
@@ -61,11 +89,7 @@ PROCESS_TABLE_TEMPLATE = Template(
         </thead>
         <tbody>
         {% for row in rows %}
-            <tr>
-            {% for header in headers %}
-                <td>{{ row[header] }}</td>
-            {% endfor %}
-            </tr>
+            {{ row }}
         {% endfor %}
         </tbody>
     </table>
@@ -73,51 +97,642 @@ PROCESS_TABLE_TEMPLATE = Template(
 )
 
 
+PROCESS_TABLE_ROW_TEMPLATE = Template(
+    """
+    <tr>
+    {% for header in headers %}
+        <td>{{ row[header] }}</td>
+    {% endfor %}
+    </tr>
+    """
+)
+
+
+PROCESS_LIST_PROJECTIONS = (
+    "pk",
+    "ctime",
+    "process_label",
+    "state",
+    "process_status",
+    "description",
+)
+
+
 def _stringify_process_cell(value):
     if value is None:
         return ""
     return str(value)
 
 
-def _normalize_process_rows(projected):
-    if not projected:
-        return [], []
+def _process_links(pks, path_to_root):
+    """Return the HTML links to the process pages of a column of pks."""
+    return [
+        f"""<a href={path_to_root}home/process.ipynb?id={pk} target="_blank">{pk}</a>"""
+        if pk
+        else ""
+        for pk in pks
+    ]
+
+
+def _format_relative_times(values, now):
+    """Format a column of datetimes relative to `now`, like "5m ago"."""
+    return [
+        ""
+        if value is None
+        else str_timedelta(now - value, negative_to_zero=True, max_num_fields=1)
+        for value in values
+    ]
+
+
+class _ProcessRow:
+    """View of one row of a `_ProcessColumns` store, indexed like a dictionary."""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._columns[key][self._index]
+
+    def get(self, key, default=None):
+        return self[key] if key in self._columns else default
+
+
+class _ProcessColumns:
+    """Raw process query results stored column by column.
+
+    Every projected attribute is one list of values. Filtering selects the same indices
+    from every column, and values are formatted a whole column at a time. Rows are only
+    materialized as `_ProcessRow` views where they are needed one by one."""
+
+    __slots__ = ("_columns", "_length")
+
+    def __init__(self, columns, length):
+        self._columns = columns
+        self._length = length
+
+    @classmethod
+    def from_query_results(cls, query_results, tag="process"):
+        columns = {}
+        length = 0
+        for query_result in query_results:
+            for attribute, value in query_result[tag].items():
+                columns.setdefault(attribute, [None] * length).append(value)
+            length += 1
+        return cls(columns, length)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, attribute):
+        # An empty store does not know the projected attributes.
+        return self._columns[attribute] if self._length else []
+
+    def rows(self):
+        return [_ProcessRow(self._columns, index) for index in range(self._length)]
+
+    def select(self, indices):
+        """Return a store with the rows at the given indices only."""
+        indices = list(indices)
+        return _ProcessColumns(
+            {
+                attribute: [column[index] for index in indices]
+                for attribute, column in self._columns.items()
+            },
+            len(indices),
+        )
+
+    def matching(self, attribute, pattern):
+        """Return the indices of the rows whose `attribute` is matched by the regex."""
+        pattern = re.compile(pattern)
+        return [
+            index
+            for index, value in enumerate(self[attribute])
+            if pattern.search(_stringify_process_cell(value))
+        ]
+
+    def format(self, mapper, projection, now=None):
+        """Return the column of a projection formatted as strings.
+
+        Times are formatted relative to `now`, which defaults to the current time."""
+        attribute = mapper.get_attribute(projection)
+        if projection in ("ctime", "mtime"):
+            return _format_relative_times(self[attribute], now or timezone.now())
+        if projection == "pk":
+            return [str(value) for value in self[attribute]]
+        return [
+            _stringify_process_cell(mapper.format(projection, row))
+            for row in self.rows()
+        ]
+
+    def table(self, mapper, projections, path_to_root, now=None):
+        """Return the formatted columns keyed by their label, with links to the processes."""
+        columns = {
+            mapper.get_label(projection): self.format(mapper, projection, now)
+            for projection in projections
+        }
+        if "pk" in projections:
+            columns[mapper.get_label("pk")] = _process_links(self["id"], path_to_root)
+        return columns
+
+
+def _add_process_links(rows, path_to_root):
+    links = _process_links([row.get("PK", "") for row in rows], path_to_root)
+    return [{**row, "PK": link} for row, link in zip(rows, links)]
+
+
+def _render_process_table_row(headers, row):
+    return PROCESS_TABLE_ROW_TEMPLATE.render(headers=headers, row=row)
+
+
+def _render_process_table(headers, rows):
+    return PROCESS_TABLE_TEMPLATE.render(
+        headers=headers, rows=[_render_process_table_row(headers, row) for row in rows]
+    )
+
+
+class _LRUCache:
+    """Mapping that keeps only the `maxsize` most recently used items.
+
+    The cache is shared by the threads of a widget, e.g. its autoupdate and export."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
 
-    headers = list(projected[0])
-    rows = [
+
+def _process_grid_columns(mapper):
+    kinds = {"pk": "link", "ctime": "time"}
+    return [
         {
-            header: _stringify_process_cell(value)
-            for header, value in zip(headers, entry)
+            "name": projection,
+            "label": mapper.get_label(projection),
+            "kind": kinds.get(projection, "text"),
         }
-        for entry in projected[1:]
+        for projection in PROCESS_LIST_PROJECTIONS
     ]
-    return headers, rows
 
 
-def _filter_process_rows(rows, description_contains):
-    if not description_contains:
-        return rows
+def _process_grid_values(mapper, processes):
+    """Return the columns of the processes in the grid, in the order of the projections.
 
-    pattern = re.compile(description_contains)
-    return [row for row in rows if pattern.search(row.get("Description", ""))]
+    The PK and the creation time are kept as numbers so that they can be sorted and
+    formatted in the browser."""
+    raw = {
+        "pk": processes["id"],
+        "ctime": [ctime.timestamp() for ctime in processes["ctime"]],
+    }
+    return [
+        raw[projection] if projection in raw else processes.format(mapper, projection)
+        for projection in PROCESS_LIST_PROJECTIONS
+    ]
 
 
-def _add_process_links(rows, path_to_root):
-    linked_rows = []
-    for row in rows:
-        linked_row = dict(row)
-        pk = linked_row.get("PK", "")
-        linked_row["PK"] = (
-            f"""<a href={path_to_root}home/process.ipynb?id={pk} target="_blank">{pk}</a>"""
-            if pk
-            else ""
+PROCESS_LIST_SORT_ATTRIBUTES = {
+    "pk": ("id", None),
+    "ctime": ("ctime", None),
+    "mtime": ("mtime", None),
+    "process_label": ("attributes.process_label", "t"),
+    "state": ("attributes.process_state", "t"),
+    "exit_status": ("attributes.exit_status", "i"),
+}
+
+
+def _combine_filters(*filters):
+    """Return QueryBuilder filters requiring all of the given filters to hold."""
+    return {"and": [f for f in filters if f]}
+
+
+CALL_LINK_TYPES = (LinkType.CALL_CALC.value, LinkType.CALL_WORK.value)
+
+
+def _process_query_attributes(builder):
+    """Return the attributes to project so that `builder.get_projected` can show any column.
+
+    The "state" column is compound, it is computed from the process state, status and
+    exit status."""
+    return sorted(
+        {
+            builder.mapper.get_attribute(projection)
+            for projection in builder.valid_projections
+            if projection != "state"
+        }
+    )
+
+
+def _process_pk_query(query_builder, tag, roots_only=False, description_regex=None):
+    """Return the SQLAlchemy query of the pks of the processes tagged `tag`.
+
+    If `roots_only` is set, the processes called by another process are excluded with a
+    NOT EXISTS clause on the call links. If `description_regex` is given, only the
+    processes whose description it matches are kept, with the `~` operator of
+    PostgreSQL. The clauses are added to the SQLAlchemy query that the QueryBuilder
+    generates. Return None for storage backends without such a query, or if the
+    database cannot match the regular expression like Python does."""
+    if description_regex is not None and not regex_in_database(description_regex):
+        return None
+    query_builder.add_projection(tag, "id")
+    try:
+        built = query_builder._impl.get_query(query_builder.as_dict())
+        link = query_builder._impl.Link
+    except AttributeError:
+        return None
+
+    process = built.tag_to_alias[tag]
+    query = built.query
+    if roots_only:
+        is_called = sa.exists().where(
+            link.output_id == process.id, link.type.in_(CALL_LINK_TYPES)
+        )
+        query = query.filter(~is_called)
+    if description_regex is not None:
+        query = query.filter(
+            process.description.regexp_match(description_regex.pattern)
         )
-        linked_rows.append(linked_row)
-    return linked_rows
+    return query.with_entities(process.id)
+
+
+def _root_process_pks(query_builder, tag, limit=None):
+    """Return the pks of the processes tagged `tag` that were not called by another process.
+
+    The called processes are excluded by the database, see `_process_pk_query`.
+    Storage backends without SQLAlchemy queries fall back to looking up the callers of
+    all processes."""
+    query = _process_pk_query(query_builder, tag, roots_only=True)
+    if query is None:
+        pks = query_builder.all(flat=True)
+        called = set()
+        if pks:
+            called = set(
+                orm.QueryBuilder()
+                .append(
+                    orm.ProcessNode,
+                    filters={"id": {"in": pks}},
+                    project="id",
+                    tag="called",
+                )
+                .append(
+                    orm.ProcessNode,
+                    with_outgoing="called",
+                    edge_filters={"type": {"in": CALL_LINK_TYPES}},
+                )
+                .all(flat=True)
+            )
+        return [pk for pk in pks if pk not in called][:limit]
+
+    if limit is not None:
+        query = query.limit(limit)
+    return [pk for (pk,) in query.all()]
+
+
+def _count_root_processes(query_builder, tag):
+    """Return the number of processes tagged `tag` that were not called by another one."""
+    query = _process_pk_query(query_builder, tag, roots_only=True)
+    if query is None:
+        return len(_root_process_pks(query_builder, tag))
+    return query.order_by(None).count()
+
+
+class _ProcessOrder:
+    """Order of the process list by one column, with the pk breaking ties.
+
+    Provides everything needed for keyset pagination: the `order_by` of the query, the
+    cursor of a raw query result and the filters selecting the processes beyond a
+    cursor. Results are never sorted in Python, since text columns are ordered by the
+    collation of the database, which Python does not know."""
+
+    def __init__(self, sort_by="ctime", descending=True):
+        self.sort_by = sort_by
+        self.attribute, self.cast = PROCESS_LIST_SORT_ATTRIBUTES[sort_by]
+        self.descending = descending
+
+        # Any attribute can be missing on some processes, e.g. the exit status of the
+        # running ones. PostgreSQL sorts missing values after all others, SQLite before.
+        self.nulls_largest = None
+        if self.attribute.startswith("attributes."):
+            self.nulls_largest = get_profile().storage_backend == "core.psql_dos"
+
+    def order_by(self, reverse=False):
+        order = "asc" if self.descending == reverse else "desc"
+        if self.cast is None:
+            return [{self.attribute: order}, {"id": order}]
+        return [{self.attribute: {"order": order, "cast": self.cast}}, {"id": order}]
+
+    def cursor(self, query_result):
+        """Return the (value, pk) keyset cursor of a raw process query result."""
+        process = query_result["process"]
+        return process.get(self.attribute), process["id"]
+
+    def keyset_filters(self, cursor, reverse=False, inclusive=False):
+        """Return filters selecting the processes after `cursor` in this order.
+
+        If `reverse` is set, the processes before the cursor are selected instead.
+        If `inclusive` is set, the process the cursor points to is selected as well."""
+        value, pk = cursor
+        operator = ">" if self.descending == reverse else "<"
+        pk_operator = f"{operator}=" if inclusive else operator
+        after_pk = {"id": {pk_operator: pk}}
+
+        if self.nulls_largest is None:
+            return {
+                "or": [
+                    {self.attribute: {operator: value}},
+                    {"and": [{self.attribute: {"==": value}}, after_pk]},
+                ]
+            }
 
+        is_null = {self.attribute: {"of_type": "null"}}
+        nulls_after_values = self.nulls_largest == (operator == ">")
+        if value is None:
+            clauses = [{"and": [is_null, after_pk]}]
+            if not nulls_after_values:
+                clauses.append({self.attribute: {"!of_type": "null"}})
+        else:
+            clauses = [
+                {self.attribute: {operator: value}},
+                {"and": [{self.attribute: {"==": value}}, after_pk]},
+            ]
+            if nulls_after_values:
+                clauses.append(is_null)
+        return {"or": clauses}
+
+    def date_cursor(self, date):
+        """Return a cursor right before the processes of `date` in this time order."""
+        if self.descending:
+            date += datetime.timedelta(days=1)
+        start = datetime.datetime.combine(date, datetime.time.min)
+        return timezone.make_aware(start), 0
+
+
+PROCESS_EXPORT_PROJECTIONS = (
+    "pk",
+    "uuid",
+    "ctime",
+    "mtime",
+    "process_label",
+    "process_state",
+    "process_status",
+    "exit_status",
+    "description",
+)
 
-def _render_process_table(headers, rows):
-    return PROCESS_TABLE_TEMPLATE.render(headers=headers, rows=rows)
+
+def export_processes(
+    query_builder,
+    path,
+    file_format="csv",
+    batch_size=1000,
+    on_progress=None,
+    description_regex=None,
+    overwrite=False,
+):
+    """Stream the processes of a query into a CSV or JSON Lines file.
+
+    The query builder must tag the processes with "process" and is extended with the
+    `PROCESS_EXPORT_PROJECTIONS`. Rows are fetched in batches of `batch_size` with
+    `QueryBuilder.iterall` and written as they arrive, so memory use does not depend
+    on the number of processes. If `description_regex` is given, only the processes
+    whose description it matches are written. `on_progress` is called with the number
+    of rows fetched after every batch. Return the number of exported processes.
+
+    A `~` at the start of `path` is expanded to the home directory of the user. An
+    existing file is only replaced if `overwrite` is set, `FileExistsError` is raised
+    otherwise."""
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError(f"Unknown export format {file_format!r}.")
+    path = os.path.expanduser(path)
+
+    mapper = CalculationQueryBuilder().mapper
+    query_builder.add_projection(
+        "process",
+        [mapper.get_attribute(projection) for projection in PROCESS_EXPORT_PROJECTIONS],
+    )
+
+    description = PROCESS_EXPORT_PROJECTIONS.index("description")
+    count = 0
+    fetched = 0
+    with open(path, "w" if overwrite else "x", newline="") as fobj:
+        writer = csv.writer(fobj)
+        if file_format == "csv":
+            writer.writerow(PROCESS_EXPORT_PROJECTIONS)
+        for row in query_builder.iterall(batch_size=batch_size):
+            fetched += 1
+            if on_progress is not None and fetched % batch_size == 0:
+                on_progress(fetched)
+            if description_regex is not None and not matches_description(
+                description_regex, row[description]
+            ):
+                continue
+            values = [
+                value.isoformat() if isinstance(value, datetime.datetime) else value
+                for value in row
+            ]
+            if file_format == "csv":
+                writer.writerow(values)
+            else:
+                fobj.write(json.dumps(dict(zip(PROCESS_EXPORT_PROJECTIONS, values))))
+                fobj.write("\n")
+            count += 1
+    if on_progress is not None:
+        on_progress(fetched)
+    return count
+
+
+def _control_result(future):
+    try:
+        result = future.result()
+    except Exception as exception:
+        return f"failed: {exception}"
+    if result is True:
+        return "done"
+    if result is False:
+        return "refused"
+    return f"unexpected response: {result}"
+
+
+def control_processes(pks, action, max_parallel=20, timeout=5.0, controller=None):
+    """Send kill, pause or play requests to the processes with the given pks.
+
+    At most `max_parallel` requests are awaiting a response at any time. Requests that
+    get no response within `timeout` seconds are cancelled. Return a mapping of each pk
+    to a short message describing the outcome of its request."""
+    if controller is None:
+        controller = get_manager().get_process_controller()
+    send = {
+        "kill": lambda pk: controller.kill_process(
+            pk, msg_text="Killed from the AiiDAlab process list."
+        ),
+        "pause": lambda pk: controller.pause_process(
+            pk, msg_text="Paused from the AiiDAlab process list."
+        ),
+        "play": controller.play_process,
+    }[action]
+
+    pks = list(dict.fromkeys(pks))
+    results = dict.fromkeys(pks, "not found")
+    active = collections.deque()
+    for pk, is_terminated in (
+        orm.QueryBuilder()
+        .append(
+            orm.ProcessNode,
+            filters={"id": {"in": pks}} if pks else {"id": {"<": 0}},
+            project=["id", "attributes.process_state"],
+        )
+        .iterall()
+    ):
+        if is_terminated in TERMINATED_PROCESS_STATES:
+            results[pk] = "already terminated"
+        else:
+            active.append(pk)
+
+    pending = {}
+    while active or pending:
+        while active and len(pending) < max_parallel:
+            pk = active.popleft()
+            try:
+                pending[unwrap_kiwi_future(send(pk))] = pk
+            except communications.UnroutableError:
+                results[pk] = "unreachable"
+        if not pending:
+            continue
+        done, _ = concurrent.futures.wait(
+            pending, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        if not done:
+            for future, pk in pending.items():
+                future.cancel()
+                results[pk] = "timed out"
+            pending.clear()
+        for future in done:
+            results[pending.pop(future)] = _control_result(future)
+    return results
+
+
+PROCESS_TIMELINE_ATTRIBUTES = (
+    "id",
+    "ctime",
+    "mtime",
+    "attributes.process_label",
+    "attributes.process_state",
+)
+
+
+def _descendant_query(process):
+    """Return the SQLAlchemy query of the timeline attributes of the processes called by
+    `process`, directly or indirectly, and the alias of the processes in it.
+
+    The call links are followed by a recursive common table expression within the
+    single query generated by the QueryBuilder. Return None for storage backends without
+    such a query."""
+    query_builder = orm.QueryBuilder().append(
+        orm.ProcessNode, project=list(PROCESS_TIMELINE_ATTRIBUTES), tag="process"
+    )
+    try:
+        built = query_builder._impl.get_query(query_builder.as_dict())
+        link = query_builder._impl.Link
+    except AttributeError:
+        return None
+
+    called = (
+        sa.select(link.output_id.label("id"))
+        .where(link.input_id == process.pk, link.type.in_(CALL_LINK_TYPES))
+        .cte("called", recursive=True)
+    )
+    called = called.union_all(
+        sa.select(link.output_id).where(
+            link.input_id == called.c.id, link.type.in_(CALL_LINK_TYPES)
+        )
+    )
+    alias = built.tag_to_alias["process"]
+    return built.query.filter(alias.id.in_(sa.select(called.c.id))), alias
+
+
+def _descendant_signature(process):
+    """Return the number of processes called by `process`, directly or indirectly, and
+    their latest modification time, None for storage backends without SQLAlchemy queries.
+
+    The signature changes whenever a process is called or changes its state."""
+    descendants = _descendant_query(process)
+    if descendants is None:
+        return None
+    query, alias = descendants
+    return tuple(
+        query.order_by(None)
+        .with_entities(sa.func.count(alias.id), sa.func.max(alias.mtime))
+        .one()
+    )
+
+
+def _descendant_processes(process):
+    """Return the processes called by `process`, directly or indirectly, as columns.
+
+    The processes are queried at once, see `_descendant_query`. Storage backends without
+    SQLAlchemy queries fall back to one query per level of the call tree."""
+    descendants = _descendant_query(process)
+    if descendants is None:
+        results = []
+        level = [process.pk]
+        while level:
+            called = (
+                orm.QueryBuilder()
+                .append(orm.ProcessNode, filters={"id": {"in": level}}, tag="caller")
+                .append(
+                    orm.ProcessNode,
+                    with_incoming="caller",
+                    edge_filters={"type": {"in": CALL_LINK_TYPES}},
+                    project=list(PROCESS_TIMELINE_ATTRIBUTES),
+                    tag="process",
+                )
+            )
+            level = []
+            for result in called.iterdict():
+                results.append(result)
+                level.append(result["process"]["id"])
+        return _ProcessColumns.from_query_results(results)
+
+    query, _ = descendants
+    columns = {attribute: [] for attribute in PROCESS_TIMELINE_ATTRIBUTES}
+    for row in query.all():
+        for attribute, value in zip(PROCESS_TIMELINE_ATTRIBUTES, row):
+            columns[attribute].append(value)
+    return _ProcessColumns(columns, len(columns["id"]))
+
+
+def _timeline_lanes(starts, ends):
+    """Assign intervals sorted by their start to the fewest lanes without overlaps.
+
+    Return the lane of every interval. The number of lanes is the largest number of
+    intervals running at the same time."""
+    lanes = []
+    free = []  # Heap of (end, lane) of the last interval of every lane.
+    for start, end in zip(starts, ends):
+        if free and free[0][0] <= start:
+            _, lane = heapq.heappop(free)
+        else:
+            lane = len(free)
+        lanes.append(lane)
+        heapq.heappush(free, (end, lane))
+    return lanes
 
 
 def get_running_calcs(process):
@@ -137,41 +752,74 @@ def get_running_calcs(process):
                 yield from get_running_calcs(out_link.node)
 
 
-class CalcJobOutputWidget(ipw.Textarea):
-    """Output of a calculation."""
+class CalcJobOutputWidget(LogViewWidget):
+    """Output of a calculation.
 
-    calculation = tl.Instance(orm.CalcJobNode, allow_none=True)
+    Only the output appended since the previous update is read and sent to the
+    browser, and no more of it is kept than the limits of the `LogViewWidget`. The
+    output of calculations on computers with another transport than `core.local` is
+    read through the transport, see `RemoteFileTail`. Errors reading the output, e.g.
+    when the connection to the computer fails, are shown in the placeholder, and the
+    next update tries again.
 
-    def __init__(self, **kwargs):
-        default_params = {
-            "value": "",
-            "placeholder": "Calculation output will appear here",
-            "description": "Calculation output:",
-            "layout": {"width": "900px", "height": "300px"},
-            "disabled": False,
-            "style": {"description_width": "initial"},
-        }
-        default_params.update(kwargs)
-        self.output = []
+    watch (bool): For calculations on computers with the `core.local` transport, read
+    the output whenever the output file changes rather than on every update, until
+    the calculation terminates. See `FileWatcher`.
+    """
 
-        # Hack to make font monospace. As far as I am aware, currently there are no better ways.
-        display(HTML("<style>textarea, input { font-family: monospace; }</style>"))
+    calculation = tl.Instance(orm.CalcJobNode, allow_none=True)
+    description = tl.Unicode("Calculation output:").tag(sync=True)
+    placeholder = tl.Unicode("Calculation output will appear here").tag(sync=True)
+    watch = tl.Bool(True)
 
-        super().__init__(**default_params)
+    def __init__(self, **kwargs):
+        kwargs.setdefault("layout", {"width": "900px", "height": "300px"})
+        self._tail = None
+        self._watcher = None
+        self._read_lock = threading.Lock()
+        # The placeholder replaced by an error message, restored once the output is read.
+        self._placeholder = None
+        super().__init__(**kwargs)
 
     @tl.observe("calculation")
     def _change_calculation(self, _=None):
         """Reset things if the observed calculation has changed."""
-        self.output = []
-        self.value = ""
+        self._stop_watching()
+        self._tail = None
+        self.clear()
+
+    def _is_local(self):
+        return self.calculation.computer.transport_type == "core.local"
+
+    def _stop_watching(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _read_output(self):
+        # Called by the watcher thread as well as by `update`.
+        with self._read_lock:
+            if self._tail is None:
+                return
+            try:
+                difference = self._tail.read(max_bytes=self.max_bytes)
+            except Exception as exception:
+                if self._placeholder is None:
+                    self._placeholder = self.placeholder
+                self.placeholder = f"Could not read the output: {exception}"
+                return
+            if self._placeholder is not None:
+                self.placeholder, self._placeholder = self._placeholder, None
+            if self._tail.restarted:
+                self.clear()
+            self.write_lines(difference)
+
+    def close(self):
+        self._stop_watching()
+        super().close()
 
     def update(self):
-        """Update the displayed output and scroll to its end.
-
-        NOTE: when this widgets is called by ProcessFollowerWidget in non-blocking manner
-        the auto-scrolling won't work. There used to be a function for the Textarea widget,
-        but it didn't work properly and got removed. For more information please visit:
-        https://github.com/jupyter-widgets/ipywidgets/issues/1815"""
+        """Update the displayed output, which the browser scrolls to its end."""
 
         if self.calculation is None:
             return
@@ -192,32 +840,165 @@ class CalcJobOutputWidget(ipw.Textarea):
                 "Nothing to show."
             )
         else:
-            if os.path.exists(output_file_path):
-                with open(output_file_path) as fobj:
-                    difference = fobj.readlines()[
-                        len(self.output) : -1
-                    ]  # Only adding the difference
-                    self.output += difference
-                    self.value += "".join(difference)
-
-        # Auto scroll down. Doesn't work in detached mode.
-        # Also a hack as it is applied to all the textareas
-        display(
-            Javascript(
-                """
-            $('textarea').each(function(){
-                // get the id
-                var id_value = $(this).attr('id');
-
-                if (typeof id_value !== 'undefined') {
-                    // the variable is defined
-                    var textarea = document.getElementById(id_value);
-                    textarea.scrollTop = textarea.scrollHeight;
-                }
-            });"""
+            # Only the lines appended since the previous update are read, and no more
+            # than can be kept.
+            if self._tail is None or self._tail.path != output_file_path:
+                self._stop_watching()
+                self._tail = (
+                    FileTail(output_file_path)
+                    if self._is_local()
+                    else RemoteFileTail(output_file_path, self.calculation.computer)
+                )
+            if self._watcher is not None:
+                if not self.calculation.is_terminated:
+                    return
+                self._stop_watching()
+            elif self.watch and not self.calculation.is_terminated and self._is_local():
+                self._watcher = FileWatcher(output_file_path, self._read_output)
+                self._watcher.start()
+            self._read_output()
+
+
+# Actions of the `ProcessActionsWidget` buttons that are only sent once confirmed.
+CONFIRMED_PROCESS_ACTIONS = ("kill", "pause")
+
+
+class ProcessActionsWidget(ipw.VBox):
+    """Kill, pause or play a selection of processes at once.
+
+    The selection is a list of process pks, which can be typed in or set from another
+    widget, e.g. the rows selected in a `ProcessTableWidget`. The requests are sent
+    from a background thread by `control_processes`, and the outcome is reported for
+    every process. Killing or pausing the selection with the buttons has to be
+    confirmed, after showing how many processes are selected."""
+
+    selection = tl.List(tl.Int())
+
+    def __init__(
+        self, get_shown_pks=None, max_parallel=20, path_to_root="../", **kwargs
+    ):
+        self.get_shown_pks = get_shown_pks
+        self.max_parallel = max_parallel
+        self.path_to_root = path_to_root
+        self._thread = None
+
+        self.pks = ipw.Text(
+            description="Selected PKs:",
+            placeholder="Comma separated PKs",
+            style={"description_width": "initial"},
+            layout={"width": "400px"},
+        )
+        self.pks.observe(self._observe_pks, names=["value"])
+        select_shown = ipw.Button(description="Select shown")
+        select_shown.on_click(self._select_shown)
+        select_shown.layout.display = None if get_shown_pks else "none"
+        self.buttons = {
+            action: ipw.Button(
+                description=action.capitalize(),
+                button_style="danger" if action == "kill" else "",
             )
+            for action in ("kill", "pause", "play")
+        }
+        for action, button in self.buttons.items():
+            button.on_click(lambda _, action=action: self.request(action))
+        # The action waiting to be confirmed, if any.
+        self._pending = None
+        self.confirm_message = ipw.HTML()
+        self.confirm_button = ipw.Button(description="Confirm", button_style="danger")
+        self.confirm_button.on_click(self.confirm)
+        cancel_button = ipw.Button(description="Cancel")
+        cancel_button.on_click(self.cancel)
+        self.confirmation = ipw.HBox(
+            [self.confirm_message, self.confirm_button, cancel_button],
+            layout={"display": "none"},
+        )
+        self.message = ipw.HTML()
+        self.results = ipw.HTML()
+        super().__init__(
+            children=[
+                ipw.HBox([self.pks, select_shown, *self.buttons.values()]),
+                self.confirmation,
+                self.message,
+                self.results,
+            ],
+            **kwargs,
         )
 
+    @tl.observe("selection")
+    def _observe_selection(self, change):
+        # A confirmation is only valid for the processes it showed the number of.
+        self.cancel()
+        self.pks.value = ", ".join(str(pk) for pk in change["new"])
+
+    def _observe_pks(self, change):
+        tokens = (token.strip() for token in change["new"].split(","))
+        self.selection = [int(token) for token in tokens if token.isdigit()]
+
+    def _select_shown(self, _=None):
+        self.selection = list(self.get_shown_pks())
+
+    def request(self, action):
+        """Ask to confirm the `action` if it is one of `CONFIRMED_PROCESS_ACTIONS`, or
+        run it right away."""
+        if action not in CONFIRMED_PROCESS_ACTIONS:
+            self.run(action)
+            return
+        if not self.selection:
+            return
+        self._pending = action
+        self.confirm_message.value = (
+            f"{action.capitalize()} {len(self.selection)} processes?"
+        )
+        self.confirm_button.description = action.capitalize()
+        self.confirmation.layout.display = None
+
+    def confirm(self, _=None):
+        """Run the action waiting to be confirmed."""
+        action = self._pending
+        self.cancel()
+        if action is not None:
+            self.run(action)
+
+    def cancel(self, _=None):
+        self._pending = None
+        self.confirmation.layout.display = "none"
+
+    def run(self, action, wait=False):
+        """Send the `action` request to the selected processes in a background thread.
+
+        The request is sent without confirmation, see `request`."""
+        if not self.selection or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(
+            target=self._run, args=(action, list(self.selection)), daemon=True
+        )
+        for button in self.buttons.values():
+            button.disabled = True
+        self._thread.start()
+        if wait:
+            self._thread.join()
+
+    def _run(self, action, pks):
+        self.message.value = f"Sending {action} requests to {len(pks)} processes..."
+        self.results.value = ""
+        try:
+            results = control_processes(pks, action, max_parallel=self.max_parallel)
+        except Exception as exception:
+            self.message.value = f"""<span style="color:red">Failed to {action} processes: {exception}</span>"""
+        else:
+            succeeded = sum(result == "done" for result in results.values())
+            self.message.value = (
+                f"{action.capitalize()} requests processed for {succeeded} "
+                f"out of {len(results)} processes."
+            )
+            rows = [{"PK": str(pk), "Result": result} for pk, result in results.items()]
+            self.results.value = _render_process_table(
+                ["PK", "Result"], _add_process_links(rows, self.path_to_root)
+            )
+        finally:
+            for button in self.buttons.values():
+                button.disabled = False
+
 
 class ProcessCallStackWidget(ipw.HTML):
     """Widget that shows process call stack."""
@@ -260,6 +1041,114 @@ class ProcessCallStackWidget(ipw.HTML):
         return string
 
 
+class ProcessExportWidget(ipw.HBox):
+    """Export the processes of a query to a CSV or JSON Lines file on disk.
+
+    The processes are taken from the query builder returned by `get_query_builder`,
+    keeping only the ones whose description is matched by the regular expression
+    returned by `get_description_regex`, if any. They are written in a background
+    thread with `export_processes`, while a progress bar shows how many of them have
+    been exported. The file is written to the home directory of the user by default,
+    and an existing file is only replaced if "Overwrite" is checked."""
+
+    def __init__(
+        self, get_query_builder, get_description_regex=None, batch_size=1000, **kwargs
+    ):
+        self.get_query_builder = get_query_builder
+        self.get_description_regex = get_description_regex
+        self.batch_size = batch_size
+        self._thread = None
+
+        self.file_format = ipw.Dropdown(
+            options=[("CSV", "csv"), ("JSON Lines", "jsonl")],
+            description="Export as:",
+            layout={"width": "200px"},
+        )
+        self.path = ipw.Text(
+            value="~/processes.csv",
+            description="File:",
+            layout={"width": "300px"},
+        )
+        self.overwrite = ipw.Checkbox(description="Overwrite", indent=False)
+        self.file_format.observe(self._observe_file_format, names=["value"])
+        self.export_button = ipw.Button(description="Export")
+        self.export_button.on_click(self.export)
+        self.progress = ipw.IntProgress(
+            value=0, min=0, max=1, bar_style="info", layout={"width": "200px"}
+        )
+        self.message = ipw.HTML()
+        super().__init__(
+            children=[
+                self.file_format,
+                self.path,
+                self.overwrite,
+                self.export_button,
+                self.progress,
+                self.message,
+            ],
+            **kwargs,
+        )
+
+    def _observe_file_format(self, change):
+        root, _ = os.path.splitext(self.path.value)
+        self.path.value = f"{root}.{change['new']}"
+
+    def export(self, _=None, wait=False):
+        """Start the export, and wait for it to finish if `wait` is set."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._export,
+            args=(
+                self.get_query_builder(),
+                self.get_description_regex() if self.get_description_regex else None,
+                self.path.value,
+                self.file_format.value,
+                self.overwrite.value,
+            ),
+            daemon=True,
+        )
+        self.export_button.disabled = True
+        self._thread.start()
+        if wait:
+            self._thread.join()
+
+    def _export(self, query_builder, description_regex, path, file_format, overwrite):
+        self.progress.value = 0
+        self.progress.max = max(query_builder.count(), 1)
+        self.progress.bar_style = "info"
+        self.message.value = "Exporting..."
+        try:
+            count = export_processes(
+                query_builder,
+                path,
+                file_format=file_format,
+                batch_size=self.batch_size,
+                on_progress=self._on_progress,
+                description_regex=description_regex,
+                overwrite=overwrite,
+            )
+        except FileExistsError:
+            self.progress.bar_style = "warning"
+            self.message.value = (
+                f"""<span style="color:red">{path} exists, check "Overwrite" to """
+                "replace it.</span>"
+            )
+        except Exception as exception:
+            self.progress.bar_style = "danger"
+            self.message.value = (
+                f"""<span style="color:red">Export failed: {exception}</span>"""
+            )
+        else:
+            self.progress.bar_style = "success"
+            self.message.value = f"Exported {count} processes to {path}."
+        finally:
+            self.export_button.disabled = False
+
+    def _on_progress(self, count):
+        self.progress.value = min(count, self.progress.max)
+
+
 class ProcessFollowerWidget(ipw.VBox):
     """A Widget that follows a process until finished."""
 
@@ -354,7 +1243,7 @@ class ProcessInputsWidget(ipw.VBox):
 
     def generate_flat_mapping(
         self, process: orm.ProcessNode | None = None
-    ) -> None | dict[str, str]:
+    ) -> dict[str, str] | None:
         """Generate a dict of input to node uuid mapping.
 
         If the input port is a namespace, it will further parse the namespace and attach the entity the
@@ -549,6 +1438,107 @@ class ProcessReportWidget(ipw.HTML):
         self.value = string.replace("\n", "<br/>")
 
 
+PROCESS_TIMELINE_TEMPLATE = Template(
+    """
+    <div>
+        {{ count }} processes from {{ first }} to {{ last }} ({{ span }}),
+        {{ busy }} in total, {{ "%.1f" | format(parallelism) }} running on average.
+    </div>
+    <svg width="100%" height="{{ height }}" viewBox="0 0 1000 {{ height }}"
+        preserveAspectRatio="none">
+    {% for bar in bars %}
+        <a href="{{ path_to_root }}home/process.ipynb?id={{ bar.pk }}" target="_blank">
+            <rect x="{{ bar.x }}" y="{{ bar.y }}" width="{{ bar.width }}" height="6"
+                fill="{{ bar.color }}">
+                <title>{{ bar.title }}</title>
+            </rect>
+        </a>
+    {% endfor %}
+    </svg>
+    """
+)
+
+PROCESS_TIMELINE_COLORS = {
+    "finished": "#27ae60",
+    "excepted": "#e74c3c",
+    "killed": "#e74c3c",
+}
+
+
+class ProcessTimelineWidget(ipw.HTML):
+    """Gantt chart of all processes called by a workflow, directly or indirectly.
+
+    Every process is a bar from its creation to its last state change. Bars are packed
+    into as few lanes as possible, so that the height shows how many processes ran at
+    the same time, and gaps show where processes ran one after the other. The timeline
+    is only queried and drawn again once a process was called or changed its state."""
+
+    process = tl.Instance(orm.ProcessNode, allow_none=True)
+
+    def __init__(self, title="Process Timeline", path_to_root="../", **kwargs):
+        self.title = title
+        self.path_to_root = path_to_root
+        # The process and the signature of its descendants the timeline was drawn for.
+        self._drawn = None
+        super().__init__(**kwargs)
+        self.update()
+
+    def update(self):
+        """Query the called processes and draw the timeline, if they have changed."""
+        if self.process is None:
+            return
+        signature = _descendant_signature(self.process)
+        if signature is not None and (self.process.pk, signature) == self._drawn:
+            return
+        self._drawn = (self.process.pk, signature)
+        processes = _descendant_processes(self.process)
+        if not len(processes):
+            self.value = "No processes were called."
+            return
+
+        order = sorted(range(len(processes)), key=processes["ctime"].__getitem__)
+        processes = processes.select(order)
+        first = processes["ctime"][0]
+        starts = [(ctime - first).total_seconds() for ctime in processes["ctime"]]
+        ends = [(mtime - first).total_seconds() for mtime in processes["mtime"]]
+        durations = [end - start for start, end in zip(starts, ends)]
+        span = max(*ends, 1e-6)
+        lanes = _timeline_lanes(starts, ends)
+
+        bars = [
+            {
+                "pk": pk,
+                "x": 1000 * start / span,
+                "y": 8 * lane,
+                "width": max(1000 * duration / span, 0.5),
+                "color": PROCESS_TIMELINE_COLORS.get(state, "#3498db"),
+                "title": f"{label}<{pk}> {state}, "
+                f"{str_timedelta(datetime.timedelta(seconds=duration))}",
+            }
+            for pk, label, state, start, duration, lane in zip(
+                processes["id"],
+                processes["attributes.process_label"],
+                processes["attributes.process_state"],
+                starts,
+                durations,
+                lanes,
+            )
+        ]
+        self.value = PROCESS_TIMELINE_TEMPLATE.render(
+            bars=bars,
+            count=len(bars),
+            first=timezone.localtime(first).strftime("%Y-%m-%d %H:%M:%S"),
+            last=timezone.localtime(first + datetime.timedelta(seconds=span)).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
+            span=str_timedelta(datetime.timedelta(seconds=span)),
+            busy=str_timedelta(datetime.timedelta(seconds=sum(durations))),
+            parallelism=sum(durations) / span,
+            height=8 * (max(lanes) + 1),
+            path_to_root=self.path_to_root,
+        )
+
+
 class ProgressBarWidget(ipw.VBox):
     """A bar showing the proggress of a process."""
 
@@ -601,6 +1591,277 @@ class ProgressBarWidget(ipw.VBox):
         return self.process.process_state.value
 
 
+class ProcessTableWidget(anywidget.AnyWidget):
+    """Data grid of processes that is sorted, scrolled and virtualized in the browser.
+
+    Rows are identified by a key, the process PK. The kernel ships the whole table in a
+    columnar layout only when a view requests it, and later sends only the rows that
+    were inserted, changed or removed."""
+
+    _esm = pathlib.Path(__file__).parent / "process_table.js"
+    _css = pathlib.Path(__file__).parent / "process_table.css"
+
+    columns = tl.List(tl.Dict()).tag(sync=True)
+    sort_column = tl.Unicode("ctime").tag(sync=True)
+    sort_descending = tl.Bool(True).tag(sync=True)
+    row_height = tl.Int(24).tag(sync=True)
+    path_to_root = tl.Unicode("../").tag(sync=True)
+    selection = tl.List(tl.Int()).tag(sync=True)
+
+    def __init__(self, **kwargs):
+        self._rows = {}
+        super().__init__(**kwargs)
+        self.on_msg(self._handle_message)
+
+    @property
+    def rows(self):
+        """Mapping of row keys to the tuples of values shown in the columns."""
+        return dict(self._rows)
+
+    def set_rows(self, rows):
+        """Replace the rows of the grid, sending only the difference to the browser."""
+        rows = {key: tuple(values) for key, values in rows.items()}
+        changed = [key for key, values in rows.items() if self._rows.get(key) != values]
+        removed = [key for key in self._rows if key not in rows]
+        self._rows = rows
+        if changed or removed:
+            self.send(
+                {"type": "diff", "upsert": self._columnar(changed), "remove": removed}
+            )
+
+    def _columnar(self, keys):
+        columns = [[] for _ in self.columns]
+        for key in keys:
+            for column, value in zip(columns, self._rows[key]):
+                column.append(value)
+        return {"keys": keys, "columns": columns}
+
+    def _handle_message(self, _, content, __):
+        if content.get("type") == "snapshot":
+            self.send(
+                {
+                    "type": "reset",
+                    "upsert": self._columnar(list(self._rows)),
+                    "remove": [],
+                }
+            )
+
+
+PROCESS_TREE_ROW_TEMPLATE = Template(
+    """
+    {% for header in headers %}
+        <span style="display: inline-block; width: 150px; overflow: hidden;
+            text-align: center; text-overflow: ellipsis; white-space: nowrap;"
+            title="{{ row[header] | striptags }}">{{ row[header] }}</span>
+    {% endfor %}
+    """
+)
+
+
+class _ProcessTreeNode(ipw.VBox):
+    """Row of a process in a `ProcessTreeWidget`, followed by the processes it called."""
+
+    def __init__(self, tree, pk):
+        self.tree = tree
+        self.pk = pk
+        self.is_expanded = False
+        self.toggle = ipw.Button(icon="caret-right", layout={"width": "32px"})
+        self.toggle.on_click(self._on_toggle)
+        self.row = ipw.HTML()
+        self.called = ipw.VBox(layout={"margin": "0px 0px 0px 32px", "display": "none"})
+        super().__init__(children=[ipw.HBox([self.toggle, self.row]), self.called])
+
+    def show(self, node_type, row):
+        """Show the rendered row of the process."""
+        # Only workflows call other processes.
+        self.toggle.disabled = not node_type.startswith("process.workflow.")
+        self.row.value = row
+
+    def _on_toggle(self, _=None):
+        if self.is_expanded:
+            self.collapse()
+        else:
+            self.expand()
+
+    def expand(self):
+        """Show the processes called by this process, querying them from the database."""
+        self.is_expanded = True
+        self.toggle.icon = "caret-down"
+        self.load()
+        self.called.layout.display = None
+
+    def collapse(self):
+        self.is_expanded = False
+        self.toggle.icon = "caret-right"
+        self.called.layout.display = "none"
+
+    def load(self):
+        """Query the processes called by this process, and reload the expanded ones."""
+        builder = CalculationQueryBuilder()
+        query_builder = (
+            orm.QueryBuilder()
+            .append(orm.ProcessNode, filters={"id": self.pk}, tag="caller")
+            .append(
+                orm.ProcessNode,
+                with_incoming="caller",
+                edge_filters={"type": {"in": CALL_LINK_TYPES}},
+                project=_process_query_attributes(builder),
+                tag="process",
+            )
+            .order_by({"process": [{"ctime": "asc"}, {"id": "asc"}]})
+        )
+        self.called.children = self.tree.show_results(query_builder.iterdict())
+
+
+class ProcessTreeWidget(ipw.VBox):
+    """Processes shown as a tree of workflows and the processes they called.
+
+    Only the root processes are given to `set_roots`. The processes called by a workflow
+    are queried when it is expanded, with one query per expansion, so that browsing
+    large workflows starts with just a few rows."""
+
+    def __init__(self, path_to_root="../", **kwargs):
+        self.path_to_root = path_to_root
+        self._nodes = {}
+        self._header = ipw.HTML(layout={"margin": "0px 0px 0px 32px"})
+        self._roots = ipw.VBox()
+        super().__init__(children=[self._header, self._roots], **kwargs)
+
+    def _render_rows(self, processes):
+        """Return the HTML of the cells of the processes in a `_ProcessColumns` store."""
+        mapper = CalculationQueryBuilder().mapper
+        headers = [
+            mapper.get_label(projection) for projection in PROCESS_LIST_PROJECTIONS
+        ]
+        if not self._header.value:
+            self._header.value = PROCESS_TREE_ROW_TEMPLATE.render(
+                headers=headers, row={header: f"<b>{header}</b>" for header in headers}
+            )
+        columns = processes.table(mapper, PROCESS_LIST_PROJECTIONS, self.path_to_root)
+        return [
+            PROCESS_TREE_ROW_TEMPLATE.render(
+                headers=headers, row=_ProcessRow(columns, index)
+            )
+            for index in range(len(processes))
+        ]
+
+    def show_results(self, query_results):
+        """Return the tree nodes showing the raw query results.
+
+        Nodes are kept by pk, so that expanded processes stay expanded across updates."""
+        processes = _ProcessColumns.from_query_results(query_results)
+        nodes = []
+        for pk, node_type, row in zip(
+            processes["id"], processes["node_type"], self._render_rows(processes)
+        ):
+            if pk not in self._nodes:
+                self._nodes[pk] = _ProcessTreeNode(self, pk)
+            self._nodes[pk].show(node_type, row)
+            nodes.append(self._nodes[pk])
+        return nodes
+
+    def set_roots(self, query_results):
+        """Show the processes of the raw query results as the roots of the tree.
+
+        The processes called by expanded processes are queried again."""
+        self._roots.children = self.show_results(query_results)
+        shown = self._prune()
+        for node in shown:
+            if node.is_expanded:
+                node.load()
+
+    def _prune(self):
+        """Forget the nodes that are not reachable from the roots, return the others."""
+        shown = []
+        stack = list(reversed(self._roots.children))
+        while stack:
+            node = stack.pop()
+            shown.append(node)
+            stack.extend(reversed(node.called.children))
+        for pk in set(self._nodes) - {node.pk for node in shown}:
+            del self._nodes[pk]
+        return shown
+
+    @property
+    def roots(self):
+        """The pks of the root processes."""
+        return [node.pk for node in self._roots.children]
+
+    def node(self, pk):
+        """Return the node showing the process with the given pk."""
+        return self._nodes[pk]
+
+
+PROCESS_LIST_VIEW_CACHE_SIZE = 16
+
+PROCESS_LIST_FILTER_TRAITS = (
+    "past_days",
+    "incoming_node",
+    "outgoing_node",
+    "process_states",
+    "process_label",
+    "description_contains",
+    "computer",
+    "code",
+    "exit_status",
+    "failed",
+)
+
+# The traits that define a view of the process list, saved by the presets.
+PROCESS_LIST_PRESET_TRAITS = (
+    *PROCESS_LIST_FILTER_TRAITS,
+    "search",
+    "sort_by",
+    "sort_descending",
+    "tree_view",
+)
+
+
+class ProcessListPresets:
+    """Named views of the `ProcessListWidget`, saved in a JSON file.
+
+    A preset maps the names of `PROCESS_LIST_PRESET_TRAITS` to their values.
+
+    path (str or Path): Location of the JSON file, by default a file in the AiiDA
+    configuration folder named after the current profile, since the presets may refer
+    to nodes of the profile.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = pathlib.Path(get_config().dirpath) / (
+                f"process_list_presets_{get_profile().name}.json"
+            )
+        self.path = pathlib.Path(path)
+        try:
+            self._presets = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            self._presets = {}
+
+    def names(self):
+        return sorted(self._presets)
+
+    def __contains__(self, name):
+        return name in self._presets
+
+    def __getitem__(self, name):
+        return dict(self._presets[name])
+
+    def save(self, name, values):
+        """Save the trait `values` as the preset `name`, replacing any existing one."""
+        self._presets[name] = {
+            trait: values[trait] for trait in PROCESS_LIST_PRESET_TRAITS
+        }
+        self._write()
+
+    def delete(self, name):
+        del self._presets[name]
+        self._write()
+
+    def _write(self):
+        self.path.write_text(json.dumps(self._presets, indent=2, sort_keys=True))
+
+
 class ProcessListWidget(ipw.VBox):
     """List of AiiDA processes.
 
@@ -617,7 +1878,59 @@ class ProcessListWidget(ipw.VBox):
     process_label (str): Show process states of type `process_label`.
 
     description_contains (str): string that should be present in the description of a process node.
+    The regular expression is translated into LIKE filters of the query where possible.
+
+    computer (str): Label of the computer the processes run on.
+
+    code (str): Label of the code used by the processes, optionally followed by
+    `@<computer label>`.
+
+    exit_status (int): Show only finished processes with this exit status.
+
+    failed (bool): Show only finished processes with a non-zero exit status.
+
+    The computer and code are joined in the query, so that all filters are applied
+    by the database.
+
+    page_size (int): Number of processes shown on one page, and loaded at once by
+    "Load more".
+
+    max_rows (int): Hard cap on the number of processes shown at once, however often
+    "Load more" is clicked.
+
+    delta_refresh (bool): Once a page is loaded, only query the processes that were
+    modified since the previous update and merge them into the shown page.
+
+    data_grid (bool): Show the processes in a `ProcessTableWidget` that receives only
+    row differences, instead of re-rendering an HTML table on every update.
+
+    sort_by (str): Column the database sorts the processes by, one of
+    `PROCESS_LIST_SORT_ATTRIBUTES`.
+
+    sort_descending (bool): Sort the processes in descending order.
+
+    search (str): Free text searched in the process labels, descriptions and extras
+    with the full-text `search_index`. The best `max_rows` matches are shown in the
+    order of their rank. The index is brought up to date in the background by the
+    `search_index_autoupdate` scheduler, see `start_autoupdate`.
+
+    tree_view (bool): List only the processes that were not called by another process,
+    in a `ProcessTreeWidget` where the processes called by a workflow are loaded when it
+    is expanded.
 
+    presets (ProcessListPresets): Named views to switch between, see `apply_preset`.
+
+    preset_ttl (float): Number of seconds during which the processes shown for a view
+    are shown again without querying the database, when switching back to it.
+
+    requery_delay (float): Number of seconds the filters and the search must stay
+    unchanged before the processes are queried again, so that typing them queries once. Results of
+    a query still running when the filters change are discarded.
+
+    Pages are addressed with keyset cursors on the sort column and the pk, so that
+    showing any page costs a single bounded query regardless of the total number of
+    processes. The matching processes are counted with a single count query when the
+    filters change, and only the processes shown are fetched.
     """
 
     past_days = tl.Int(7)
@@ -626,68 +1939,902 @@ class ProcessListWidget(ipw.VBox):
     process_states = tl.List()
     process_label = tl.Unicode(allow_none=True)
     description_contains = tl.Unicode(allow_none=True)
-
-    def __init__(self, path_to_root="../", **kwargs):
+    computer = tl.Unicode(allow_none=True)
+    code = tl.Unicode(allow_none=True)
+    exit_status = tl.Int(None, allow_none=True)
+    failed = tl.Bool(False)
+    page_size = tl.Int(100)
+    max_rows = tl.Int(1000)
+    delta_refresh = tl.Bool(False)
+    data_grid = tl.Bool(False)
+    sort_by = tl.Unicode("ctime")
+    sort_descending = tl.Bool(True)
+    tree_view = tl.Bool(False)
+    search = tl.Unicode(allow_none=True)
+    preset_ttl = tl.Float(60)
+    requery_delay = tl.Float(0.5)
+
+    def __init__(self, path_to_root="../", search_index=None, presets=None, **kwargs):
         self.path_to_root = path_to_root
+        self.search_index = search_index
+        self.presets = presets
+        # Ranks of the processes found by the search, None unless searching.
+        self._search_ranks = None
+
+        # Cursor of the first process shown on the current page (None for the first page)
+        # and of the first process on the next page (None if there is no next page).
+        self._page_start = None
+        self._next_page_start = None
+        # Number of processes shown on the current page, grown by "Load more".
+        self._page_limit = min(self.page_size, self.max_rows)
+
+        # Raw query results of the current page keyed by pk, and the highest
+        # modification time among them, used by the delta-refresh mode.
+        self._page_cache = None
+        self._last_mtime = None
+        self._update_lock = threading.Lock()
+        # Incremented whenever the filters change, to tell which version of the
+        # filters the shown processes match.
+        self._filters_version = 0
+        self._shown_version = 0
+        self._requery_timer = None
+        # Whether changes of the filters, order or view query the processes again,
+        # which they do not while the widget is initialized or a preset is applied.
+        self._query_on_change = False
+        self._shown_pks = []
+        self.matching_count = None
+        # The filters and view the matching processes were counted for.
+        self._counted_key = None
+
+        # Rendered rows of the HTML table keyed by the pk and modification time.
+        self._rendered_rows = _LRUCache(maxsize=2 * self.max_rows)
+        # Query builders of the processes keyed by the filters, and the last results of
+        # the views keyed by their traits, to switch between presets without querying.
+        self._query_builders = _LRUCache(maxsize=PROCESS_LIST_VIEW_CACHE_SIZE)
+        self._views = _LRUCache(maxsize=PROCESS_LIST_VIEW_CACHE_SIZE)
+        self._updated_at = None
+
+        self.autoupdate = AutoupdateScheduler(self._autoupdate)
+        self.search_index_autoupdate = AutoupdateScheduler(self._update_search_index)
+        self._page_visibility = PageVisibilityWidget()
+        self._page_visibility.observe(self._observe_page_visibility, names=["visible"])
+
         self.table = ipw.HTML()
+        self.grid = ProcessTableWidget(path_to_root=path_to_root)
+        self.tree = ProcessTreeWidget(path_to_root=path_to_root)
+        self.statistics = ProcessStatisticsWidget(
+            self._get_query_builder, self._get_description_regex
+        )
+        self.throughput = ProcessThroughputWidget(self._get_query_builder)
+        self.actions = ProcessActionsWidget(
+            get_shown_pks=self._get_shown_pks, path_to_root=path_to_root
+        )
+        tl.link((self.grid, "selection"), (self.actions, "selection"))
+        self.export = ProcessExportWidget(
+            lambda: self._get_query_builder().order_by(
+                {"process": self._order().order_by()}
+            ),
+            self._get_description_regex,
+        )
         self.output = ipw.HTML()
+        self.matching = ipw.HTML()
         update_button = ipw.Button(description="Update now")
-        update_button.on_click(self.update)
+        update_button.on_click(self.refresh)
+        update_button.on_click(self._update_panels)
+
+        self._previous_page_button = ipw.Button(
+            description="Previous page", disabled=True
+        )
+        self._previous_page_button.on_click(self.previous_page)
+        self._next_page_button = ipw.Button(description="Next page", disabled=True)
+        self._next_page_button.on_click(self.next_page)
+        self._load_more_button = ipw.Button(description="Load more", disabled=True)
+        self._load_more_button.on_click(self.load_more)
+        self._jump_to_date = ipw.DatePicker(
+            description="Jump to date:", style={"description_width": "initial"}
+        )
+        self._jump_to_date.observe(self._observe_jump_to_date, names=["value"])
+        self._sort_by = ipw.Dropdown(
+            options=[
+                (CalculationQueryBuilder().mapper.get_label(column), column)
+                for column in PROCESS_LIST_SORT_ATTRIBUTES
+            ],
+            description="Sort by:",
+        )
+        self._sort_descending = ipw.ToggleButton(description="Descending")
+        self._search = ipw.Text(
+            description="Search:",
+            placeholder="Words in labels, descriptions or extras",
+            layout={"display": None if search_index else "none"},
+        )
+        if search_index is not None and not search_index.is_built:
+            self._search.placeholder = (
+                "Build the index with: python -m home.process_index --rebuild"
+            )
+        self._preset = ipw.Dropdown(description="Preset:")
+        self._preset.observe(self._observe_preset, names=["value"])
+        self._preset_name = ipw.Text(placeholder="Name of the preset")
+        save_preset_button = ipw.Button(description="Save preset")
+        save_preset_button.on_click(
+            lambda _=None: self.save_preset(self._preset_name.value)
+        )
+        delete_preset_button = ipw.Button(description="Delete preset")
+        delete_preset_button.on_click(
+            lambda _=None: self.delete_preset(self._preset.value)
+        )
+        self._update_preset_options()
+
         super().__init__(
-            children=[ipw.HBox([self.output, update_button]), self.table], **kwargs
+            children=[
+                self.statistics,
+                self.throughput,
+                ipw.HBox(
+                    [
+                        self.output,
+                        self.matching,
+                        self._search,
+                        update_button,
+                        self._page_visibility,
+                    ]
+                ),
+                ipw.HBox(
+                    [
+                        self._preset,
+                        self._preset_name,
+                        save_preset_button,
+                        delete_preset_button,
+                    ],
+                    layout={"display": None if presets else "none"},
+                ),
+                ipw.HBox(
+                    [
+                        self._previous_page_button,
+                        self._next_page_button,
+                        self._load_more_button,
+                        self._jump_to_date,
+                        self._sort_by,
+                        self._sort_descending,
+                    ]
+                ),
+                self.actions,
+                self.export,
+                self.table,
+            ],
+            **kwargs,
         )
+        tl.link((self, "sort_by"), (self._sort_by, "value"))
+        tl.link((self, "sort_descending"), (self._sort_descending, "value"))
+        tl.link((self, "search"), (self._search, "value"))
+        self.grid.observe(
+            self._observe_grid_sort, names=["sort_column", "sort_descending"]
+        )
+        self._show_table_view()
+        self._update_panels()
         self.update()
+        self._query_on_change = True
 
-    def update(self, _=None):
-        """Perform the query."""
-        builder = CalculationQueryBuilder()
+    def _get_filters(self, builder):
         filters = builder.get_filters(
             all_entries=False,
             process_state=self.process_states,
             process_label=self.process_label,
-            exit_status=None,
-            failed=None,
+            exit_status=self.exit_status,
+            failed=self.failed,
         )
-        relationships = {}
+        description_filters, _ = description_like_filters(self.description_contains)
+        search_filters = {}
+        if self._search_ranks is not None:
+            pks = list(self._search_ranks)
+            search_filters = {"id": {"in": pks}} if pks else {"id": {"<": 0}}
+        return _combine_filters(filters, description_filters, search_filters)
+
+    def _append_relationships(self, query_builder):
+        """Join the nodes, computer and code the processes must be related to."""
         if self.incoming_node:
-            relationships = {
-                **relationships,
-                **{"with_outgoing": orm.load_node(self.incoming_node)},
-            }
+            node = orm.load_node(self.incoming_node)
+            query_builder.append(
+                type(node), filters={"id": node.pk}, with_outgoing="process"
+            )
 
         if self.outgoing_node:
-            relationships = {
-                **relationships,
-                **{"with_incoming": orm.load_node(self.outgoing_node)},
-            }
+            node = orm.load_node(self.outgoing_node)
+            query_builder.append(
+                type(node), filters={"id": node.pk}, with_incoming="process"
+            )
+
+        if self.computer:
+            query_builder.append(
+                orm.Computer, filters={"label": self.computer}, with_node="process"
+            )
+
+        if self.code:
+            label, _, computer = self.code.partition("@")
+            query_builder.append(
+                orm.AbstractCode,
+                filters={"label": label},
+                with_outgoing="process",
+                tag="code",
+            )
+            if computer:
+                query_builder.append(
+                    orm.Computer, filters={"label": computer}, with_node="code"
+                )
+
+    def _get_query_builder(self, filters=None):
+        """Return a QueryBuilder of the processes matching the filters, tagged "process".
 
-        query_set = builder.get_query_set(
-            filters=filters,
-            past_days=None if self.past_days < 0 else self.past_days,
-            order_by={"ctime": "desc"},
-            relationships=relationships,
-        )
-        projected = builder.get_projected(
-            query_set,
-            projections=[
-                "pk",
-                "ctime",
-                "process_label",
-                "state",
-                "process_status",
-                "description",
+        The query builder of the filters defined by the traits is built once, loading
+        the nodes the processes must be related to, and copied for every query. The
+        additional `filters` of the processes, e.g. keyset cursors, are added to the
+        copy."""
+        key = (
+            self._view_key(PROCESS_LIST_FILTER_TRAITS),
+            None if self._search_ranks is None else tuple(self._search_ranks),
+        )
+        built = self._query_builders.get(key)
+        if built is None:
+            trait_filters = self._get_filters(CalculationQueryBuilder())
+            built = (self._build_query_builder(trait_filters), trait_filters)
+            self._query_builders[key] = built
+        query_builder, trait_filters = built
+        query_builder = copy.deepcopy(query_builder)
+        if filters:
+            # The filters of the traits are replaced, since `add_filter` updates the
+            # filters of the tag, so they are combined with the additional ones.
+            query_builder.add_filter(
+                "process", _combine_filters(trait_filters, filters)
+            )
+        if self.past_days >= 0:
+            query_builder.add_filter(
+                "process",
+                {
+                    "ctime": {
+                        ">": timezone.now() - datetime.timedelta(days=self.past_days)
+                    }
+                },
+            )
+        return query_builder
+
+    def _get_description_regex(self):
+        return remaining_description_regex(self.description_contains)
+
+    def _build_query_builder(self, filters):
+        query_builder = orm.QueryBuilder().append(
+            orm.ProcessNode, filters=filters, tag="process"
+        )
+        self._append_relationships(query_builder)
+        return query_builder
+
+    def _get_query_set(self, builder, filters, order, reverse=False, limit=None):
+        """Return the raw results of the first `limit` processes matching the filters
+        and the additional `filters`, that can be shown in the current view, in `order`."""
+        order_by = {"process": order.order_by(reverse)}
+        if self.tree_view or self._get_description_regex() is not None:
+            pks = self._query_pks(filters, order, reverse, limit)
+            query_builder = orm.QueryBuilder().append(
+                orm.ProcessNode,
+                filters={"id": {"in": pks}} if pks else {"id": {"<": 0}},
+                tag="process",
+            )
+            query_builder.order_by(order_by)
+        else:
+            query_builder = self._get_query_builder(filters).order_by(order_by)
+            if limit is not None:
+                query_builder.limit(limit)
+        query_builder.add_projection("process", _process_query_attributes(builder))
+        return query_builder.iterdict()
+
+    def _query_pks(self, filters, order, reverse=False, limit=None):
+        """Return the pks of the first `limit` processes matching the filters and the
+        additional `filters`, that can be shown in the current view, in `order`.
+
+        The database excludes the processes called by another one in the tree view,
+        and the ones whose description is not matched by the regular expression where
+        it can, see `_process_pk_query`. Otherwise, processes are read in keyset
+        batches of `page_size` until `limit` of them match."""
+        query_builder = self._get_query_builder(filters).order_by(
+            {"process": order.order_by(reverse)}
+        )
+        description_regex = self._get_description_regex()
+        query = _process_pk_query(
+            query_builder, "process", self.tree_view, description_regex
+        )
+        if query is not None:
+            if limit is not None:
+                query = query.limit(limit)
+            return [pk for (pk,) in query.all()]
+        if description_regex is None:
+            if self.tree_view:
+                return _root_process_pks(query_builder, "process", limit)
+            if limit is not None:
+                query_builder.limit(limit)
+            return query_builder.all(flat=True)
+
+        pks = []
+        batch_filters = filters
+        while limit is None or len(pks) < limit:
+            query_builder = self._get_query_builder(batch_filters).order_by(
+                {"process": order.order_by(reverse)}
+            )
+            query_builder.add_projection(
+                "process", sorted({"id", "description", order.attribute})
+            )
+            results = list(query_builder.limit(self.page_size).iterdict())
+            matching = [
+                result["process"]["id"]
+                for result in results
+                if matches_description(
+                    description_regex, result["process"]["description"]
+                )
+            ]
+            if self.tree_view and matching:
+                roots = set(
+                    _root_process_pks(
+                        orm.QueryBuilder().append(
+                            orm.ProcessNode,
+                            filters={"id": {"in": matching}},
+                            tag="process",
+                        ),
+                        "process",
+                    )
+                )
+                matching = [pk for pk in matching if pk in roots]
+            pks.extend(matching)
+            if len(results) < self.page_size:
+                break
+            batch_filters = _combine_filters(
+                filters,
+                order.keyset_filters(order.cursor(results[-1]), reverse=reverse),
+            )
+        return pks[:limit]
+
+    def update(self, _=None):
+        """Perform the query for the current page and return whether it has changed.
+
+        In the delta-refresh mode, only processes modified since the previous query
+        are fetched once the page has been loaded. The matching processes are only
+        counted again when the filters or the view change, see `refresh`. An invalid
+        regular expression in `description_contains`, e.g. one that is still being typed,
+        is reported in the output instead of querying."""
+        with self._update_lock:
+            error = self._description_error()
+            if error is not None:
+                self.output.value = f'<span style="color:red">{error}</span>'
+                return False
+            version = self._filters_version
+            previous = self._page_signature()
+            if self._update_search_ranks():
+                self._page_cache = None
+            count_key = self._count_key()
+            if count_key != self._counted_key:
+                matching_count = self._count_matching()
+                if self._filters_version != version:
+                    return self._discard_update()
+                self._counted_key = count_key
+                self.matching_count = matching_count
+                self.matching.value = f"({self.matching_count} matching processes)"
+            if self.delta_refresh and self._page_cache is not None:
+                self._refresh_page_cache()
+            else:
+                self._load_page()
+            if self._filters_version != version:
+                return self._discard_update()
+            self._render_page()
+            self._updated_at = time.monotonic()
+            self._shown_version = version
+            return self._page_signature() != previous
+
+    def _description_error(self):
+        """Return why `description_contains` is not a valid regular expression, if not."""
+        try:
+            re.compile(self.description_contains or "")
+        except re.error as error:
+            return f"Invalid regular expression: {error}."
+        return None
+
+    def _update_panels(self, _=None):
+        """Update the statistics and the throughput, unless the filters are invalid."""
+        if self._description_error() is None:
+            self.statistics.update()
+            self.throughput.update()
+
+    def refresh(self, _=None):
+        """Count the matching processes again and update the current page."""
+        self._counted_key = None
+        return self.update()
+
+    def _count_key(self):
+        return (
+            self._view_key(PROCESS_LIST_FILTER_TRAITS),
+            None if self._search_ranks is None else tuple(self._search_ranks),
+            self.tree_view,
+        )
+
+    def _count_matching(self):
+        """Count the processes that can be shown with the current filters and view.
+
+        Like the shown processes, only the ones not called by another process are
+        counted in the tree view, and the descriptions are matched with the regular
+        expression in Python if the database cannot match it."""
+        query_builder = self._get_query_builder()
+        description_regex = self._get_description_regex()
+        if description_regex is None:
+            if self.tree_view:
+                return _count_root_processes(query_builder, "process")
+            return query_builder.count()
+        query = _process_pk_query(
+            query_builder, "process", self.tree_view, description_regex
+        )
+        if query is not None:
+            return query.order_by(None).count()
+
+        roots = None
+        if self.tree_view:
+            roots = set(_root_process_pks(self._get_query_builder(), "process"))
+        query_builder.add_projection("process", ["id", "description"])
+        return sum(
+            (roots is None or pk in roots)
+            and matches_description(description_regex, description)
+            for pk, description in query_builder.iterall(batch_size=1000)
+        )
+
+    def _discard_update(self):
+        # The filters changed while querying, query again with the new filters.
+        self._page_cache = None
+        self._schedule_requery()
+        return False
+
+    def _schedule_requery(self):
+        """Query again once the filters stay unchanged for `requery_delay` seconds."""
+        if self._requery_timer is not None:
+            self._requery_timer.cancel()
+        self._requery_timer = threading.Timer(
+            self.requery_delay, self._requery, args=(self._filters_version,)
+        )
+        self._requery_timer.daemon = True
+        self._requery_timer.start()
+
+    def _requery(self, version):
+        if self.comm is None or self._shown_version >= version:
+            # The widget was closed, or the processes were queried in the meantime.
+            return
+        self.update()
+        self._update_panels()
+
+    def _view_key(self, traits=PROCESS_LIST_PRESET_TRAITS):
+        return tuple(
+            (trait, tuple(value) if isinstance(value, list) else value)
+            for trait, value in ((trait, getattr(self, trait)) for trait in traits)
+        )
+
+    def _preset_values(self):
+        return {trait: getattr(self, trait) for trait in PROCESS_LIST_PRESET_TRAITS}
+
+    def _update_preset_options(self):
+        names = self.presets.names() if self.presets else []
+        current = self._preset.value
+        with self._preset.hold_trait_notifications():
+            self._preset.options = [("", None), *((name, name) for name in names)]
+            self._preset.value = current if current in names else None
+
+    def save_preset(self, name):
+        """Save the current filters, search, order and view as the preset `name`."""
+        if not name:
+            return
+        self.presets.save(name, self._preset_values())
+        self._update_preset_options()
+        self._preset.value = name
+
+    def delete_preset(self, name):
+        if name is None or name not in self.presets:
+            return
+        self.presets.delete(name)
+        self._update_preset_options()
+
+    def apply_preset(self, name):
+        """Show the view saved as the preset `name`.
+
+        The processes, statistics and throughput last shown for this view are shown
+        again without querying the database if they are not older than `preset_ttl`."""
+        with self._update_lock:
+            if self._page_cache is not None and self._page_start is None:
+                self._views[self._view_key()] = self._snapshot()
+            self._reset_page()
+            self._page_cache = None
+        # The view is restored or queried below, not by the observers of the traits.
+        self._query_on_change = False
+        try:
+            with self.hold_trait_notifications():
+                for trait, value in self.presets[name].items():
+                    setattr(self, trait, value)
+        finally:
+            self._query_on_change = True
+        self._preset.value = name
+
+        view = self._views.get(self._view_key())
+        if view is not None and time.monotonic() - view["updated_at"] < self.preset_ttl:
+            with self._update_lock:
+                self._restore(view)
+            return
+        self.update()
+        self._update_panels()
+
+    def _snapshot(self):
+        return {
+            "updated_at": self._updated_at,
+            "page_cache": dict(self._page_cache),
+            "page_limit": self._page_limit,
+            "last_mtime": self._last_mtime,
+            "search_ranks": self._search_ranks,
+            "matching_count": self.matching_count,
+            "statistics": self.statistics.counts,
+            "throughput": (self.throughput.unit.value, self.throughput.counts),
+        }
+
+    def _restore(self, view):
+        self._updated_at = view["updated_at"]
+        self._page_cache = dict(view["page_cache"])
+        self._page_limit = view["page_limit"]
+        self._last_mtime = view["last_mtime"]
+        self._search_ranks = view["search_ranks"]
+        self._shown_version = self._filters_version
+        self.matching_count = view["matching_count"]
+        self._counted_key = self._count_key()
+        self.matching.value = f"({self.matching_count} matching processes)"
+        self._render_page()
+        self.statistics.counts = view["statistics"]
+        self.statistics.value = self.statistics._render()
+        unit, counts = view["throughput"]
+        if unit == self.throughput.unit.value:
+            self.throughput.counts = counts
+            self.throughput.chart.value = self.throughput._render(unit)
+        else:
+            self.throughput.update()
+
+    def _observe_preset(self, change):
+        name = change["new"]
+        if name is None:
+            return
+        self._preset_name.value = name
+        if self.presets[name] != self._preset_values():
+            self.apply_preset(name)
+
+    def _update_search_ranks(self):
+        """Search again and return whether the found processes have changed."""
+        previous = self._search_ranks
+        if self.search_index is None or not self.search:
+            self._search_ranks = None
+        else:
+            pks = self.search_index.search(self.search, limit=self.max_rows)
+            self._search_ranks = {pk: rank for rank, pk in enumerate(pks)}
+        return self._search_ranks != previous
+
+    @property
+    def _shown_limit(self):
+        # All processes found by the search are shown, ordered by their rank.
+        return self.max_rows if self._search_ranks is not None else self._page_limit
+
+    def _page_signature(self):
+        if self._page_cache is None:
+            return None
+        return {
+            pk: result["process"]["mtime"] for pk, result in self._page_cache.items()
+        }
+
+    def _get_shown_pks(self):
+        return list(self._shown_pks)
+
+    def _order(self):
+        return _ProcessOrder(self.sort_by, self.sort_descending)
+
+    def _page_filters(self, order):
+        if self._page_start is None:
+            return {}
+        return order.keyset_filters(self._page_start, inclusive=True)
+
+    def _load_page(self):
+        builder = CalculationQueryBuilder()
+        order = self._order()
+        # Fetch one extra process to learn where the next page starts.
+        results = list(
+            self._get_query_set(
+                builder,
+                self._page_filters(order),
+                order,
+                limit=self._shown_limit + 1,
+            )
+        )
+        self._page_cache = {result["process"]["id"]: result for result in results}
+        self._last_mtime = max(
+            (result["process"]["mtime"] for result in results), default=None
+        )
+
+    def _refresh_page_cache(self):
+        """Merge the processes modified since the last query into the page cache."""
+        if self._last_mtime is None:
+            self._load_page()
+            return
+
+        builder = CalculationQueryBuilder()
+        order = self._order()
+        page_range = []
+        if self._page_start is not None:
+            page_range.append(order.keyset_filters(self._page_start, inclusive=True))
+        cached = self._sorted_page_cache()
+        is_full = len(cached) > self._shown_limit
+        if is_full:
+            page_range.append(
+                order.keyset_filters(
+                    order.cursor(cached[-1]), reverse=True, inclusive=True
+                )
+            )
+        modified = {"mtime": {">": self._last_mtime}}
+
+        matching = list(
+            self._get_query_set(
+                builder,
+                _combine_filters(modified, *page_range),
+                order,
+            )
+        )
+        # Cached processes that were deleted, or do not match the filters anymore, e.g.
+        # because they were created more than `past_days` ago. The page is bounded by
+        # the page size, so all of them are looked up, not only the modified ones.
+        departed = set()
+        if self._page_cache:
+            cached_filters = {"id": {"in": list(self._page_cache)}}
+            departed = set(self._page_cache) - set(
+                self._query_pks(
+                    _combine_filters(cached_filters, *page_range),
+                    order,
+                )
+            )
+
+        if not matching and not departed:
+            return
+        for pk in departed:
+            del self._page_cache[pk]
+        for result in matching:
+            self._page_cache[result["process"]["id"]] = result
+            self._last_mtime = max(self._last_mtime, result["process"]["mtime"])
+
+        if departed and is_full:
+            # Processes from the next page may have moved up, which the cache cannot know.
+            self._load_page()
+            return
+        # The database tells where the modified processes go, in the order of the
+        # page. Processes pushed off the page by new ones are not kept, only the page
+        # and the first process of the next page, the cursor where it starts.
+        pks = self._query_page_pks(order)
+        if not set(pks) <= self._page_cache.keys():
+            self._load_page()
+            return
+        self._page_cache = {pk: self._page_cache[pk] for pk in pks}
+
+    def _query_page_pks(self, order):
+        """Return the pks of the processes of the page and of the first process of the
+        next page, in the order of the database."""
+        return self._query_pks(
+            self._page_filters(order), order, limit=self._shown_limit + 1
+        )
+
+    def _sorted_page_cache(self):
+        if self._search_ranks is not None:
+            return sorted(
+                self._page_cache.values(),
+                key=lambda result: self._search_ranks[result["process"]["id"]],
+            )
+        # The processes are kept in the order the database returned them.
+        return list(self._page_cache.values())[: self._page_limit + 1]
+
+    def _render_page(self):
+        results = self._sorted_page_cache()
+        page = results[: self._shown_limit]
+        self._next_page_start = (
+            self._order().cursor(results[self._shown_limit])
+            if len(results) > self._shown_limit
+            else None
+        )
+        self._previous_page_button.disabled = self._page_start is None
+        self._next_page_button.disabled = self._next_page_start is None
+        self._load_more_button.disabled = (
+            self._next_page_start is None or self._page_limit >= self.max_rows
+        )
+        self._jump_to_date.disabled = self.sort_by not in ("ctime", "mtime")
+
+        builder = CalculationQueryBuilder()
+        # The descriptions of the processes were matched by the query already.
+        processes = _ProcessColumns.from_query_results(page)
+
+        self.output.value = f"{len(processes)} processes shown"
+        self._shown_pks = list(processes["id"])
+
+        if self.tree_view:
+            shown = set(self._shown_pks)
+            self.tree.set_roots(
+                [result for result in page if result["process"]["id"] in shown]
+            )
+            return
+
+        if self.data_grid:
+            self.grid.columns = _process_grid_columns(builder.mapper)
+            self.grid.set_rows(
+                dict(
+                    zip(
+                        processes["id"],
+                        zip(*_process_grid_values(builder.mapper, processes)),
+                    )
+                )
+            )
+            return
+
+        self.table.value = PROCESS_TABLE_TEMPLATE.render(
+            headers=[
+                builder.mapper.get_label(projection)
+                for projection in PROCESS_LIST_PROJECTIONS
             ],
+            rows=self._render_rows(builder.mapper, processes),
         )
-        headers, rows = _normalize_process_rows(projected)
 
-        # Keep only process that contain the requested string in the description.
-        rows = _filter_process_rows(rows, self.description_contains)
+    def _render_rows(self, mapper, processes):
+        """Return the HTML of the table rows of the processes.
+
+        Rows are rendered again only if the process was modified, or if its creation
+        time, which is shown relative to now, is shown differently."""
+        headers = [
+            mapper.get_label(projection) for projection in PROCESS_LIST_PROJECTIONS
+        ]
+        now = timezone.now()
+        created = processes.format(mapper, "ctime", now)
+        keys = list(zip(processes["id"], processes["mtime"]))
+
+        rows = [None] * len(keys)
+        stale = []
+        for index, key in enumerate(keys):
+            cached = self._rendered_rows.get(key)
+            if cached is not None and cached[0] == created[index]:
+                rows[index] = cached[1]
+            else:
+                stale.append(index)
 
-        self.output.value = f"{len(rows)} processes shown"
+        columns = processes.select(stale).table(
+            mapper, PROCESS_LIST_PROJECTIONS, self.path_to_root, now
+        )
+        for position, index in enumerate(stale):
+            rows[index] = _render_process_table_row(
+                headers, _ProcessRow(columns, position)
+            )
+            self._rendered_rows[keys[index]] = (created[index], rows[index])
+        return rows
 
-        # Add HTML links.
-        rows = _add_process_links(rows, self.path_to_root)
-        self.table.value = _render_process_table(headers, rows)
+    def next_page(self, _=None):
+        """Show the page of processes following the current one."""
+        if self._page_cache is None or self._next_page_start is None:
+            # No page is shown, or the filters changed and it is being queried again.
+            return
+        self._show_page(self._next_page_start)
+
+    def load_more(self, _=None):
+        """Append the next batch of processes to the current page.
+
+        At most `page_size` processes are fetched, and no more than `max_rows` are shown."""
+        with self._update_lock:
+            batch = min(self.page_size, self.max_rows - self._page_limit)
+            if self._page_cache is None or self._next_page_start is None or batch <= 0:
+                return
+            builder = CalculationQueryBuilder()
+            order = self._order()
+            filters = order.keyset_filters(self._next_page_start, inclusive=True)
+            for result in self._get_query_set(builder, filters, order, limit=batch + 1):
+                self._page_cache[result["process"]["id"]] = result
+                self._last_mtime = max(self._last_mtime, result["process"]["mtime"])
+            self._page_limit += batch
+            self._render_page()
+
+    def previous_page(self, _=None):
+        """Show the page of processes preceding the current one."""
+        if self._page_start is None:
+            return
+        builder = CalculationQueryBuilder()
+        order = self._order()
+        filters = order.keyset_filters(self._page_start, reverse=True)
+        preceding = list(
+            self._get_query_set(
+                builder, filters, order, reverse=True, limit=self.page_size + 1
+            )
+        )
+        # If no more than a page of preceding processes exists, we are back on the first page.
+        self._show_page(
+            order.cursor(preceding[self.page_size - 1])
+            if len(preceding) > self.page_size
+            else None
+        )
+
+    def jump_to_date(self, date):
+        """Show the page starting at `date` when sorting by creation or modification time.
+
+        In descending order, the page starts with the newest process of `date` or
+        earlier, in ascending order with the oldest process of `date` or later."""
+        self._show_page(None if date is None else self._order().date_cursor(date))
+
+    def _observe_jump_to_date(self, change):
+        self.jump_to_date(change["new"])
+
+    def _show_page(self, page_start):
+        self._page_start = page_start
+        self._page_limit = min(self.page_size, self.max_rows)
+        self._page_cache = None
+        self.update()
+
+    @tl.observe("data_grid")
+    def _show_table_view(self, _=None):
+        with self._update_lock:
+            if self._page_cache is not None:
+                self._render_page()
+        if self.children:
+            if self.tree_view:
+                view = self.tree
+            else:
+                view = self.grid if self.data_grid else self.table
+            self.children = (*self.children[:-1], view)
+
+    @tl.observe("tree_view")
+    def _observe_tree_view(self, _=None):
+        """Query the processes for the new view, unless the widget is being initialized."""
+        self._reset_page()
+        if self._query_on_change:
+            self.update()
+        self._show_table_view()
+
+    @tl.observe(*PROCESS_LIST_FILTER_TRAITS, "search", "page_size", "max_rows")
+    def _observe_filters(self, _=None):
+        """Query again shortly, unless the widget is being initialized."""
+        self._reset_page()
+        if self._query_on_change:
+            self._schedule_requery()
+
+    def _reset_page(self):
+        """Go back to the first page when the filters change.
+
+        The page of an update that is running is not dropped under its feet, the update
+        discards it when it sees the new version of the filters. The page cannot be left
+        until the processes matching the new filters are shown."""
+        self._filters_version += 1
+        self._page_start = None
+        self._next_page_start = None
+        self._page_limit = min(self.page_size, self.max_rows)
+        self._previous_page_button.disabled = True
+        self._next_page_button.disabled = True
+        self._load_more_button.disabled = True
+        if self._update_lock.acquire(blocking=False):
+            self._page_cache = None
+            self._update_lock.release()
+
+    @tl.observe("max_rows")
+    def _observe_max_rows(self, change):
+        self._rendered_rows.maxsize = 2 * change["new"]
+
+    @tl.validate("sort_by")
+    def _validate_sort_by(self, provided):
+        if provided["value"] not in PROCESS_LIST_SORT_ATTRIBUTES:
+            raise tl.TraitError(f"Cannot sort processes by {provided['value']!r}.")
+        return provided["value"]
+
+    @tl.observe("sort_by", "sort_descending")
+    def _observe_sort(self, _=None):
+        """Show the first page in the new order, unless the widget is being initialized."""
+        self._reset_page()
+        self.grid.sort_column = self.sort_by
+        self.grid.sort_descending = self.sort_descending
+        if self._query_on_change:
+            self.update()
+
+    def _observe_grid_sort(self, _=None):
+        # Let the database sort by the column clicked in the grid, if it can.
+        if self.grid.sort_column in PROCESS_LIST_SORT_ATTRIBUTES:
+            with self.hold_trait_notifications():
+                self.sort_by = self.grid.sort_column
+                self.sort_descending = self.grid.sort_descending
 
     @tl.validate("incoming_node")
     def _validate_incoming_node(self, provided):
@@ -717,20 +2864,72 @@ class ProcessListWidget(ipw.VBox):
     def _default_process_label(self):
         return None
 
-    @tl.validate("process_label")
-    def _validate_process_label(self, provided):
+    @tl.validate("process_label", "computer", "code")
+    def _validate_optional_label(self, provided):
         if provided["value"]:
             return provided["value"]
         return None
 
-    def _follow(self, update_interval):
-        while True:
-            self.update()
-            time.sleep(update_interval)
+    def _autoupdate(self):
+        if self.comm is None:
+            # The widget was closed.
+            self.autoupdate.stop()
+            return False
+        if not self._page_visibility.visible:
+            return False
+        return self.update()
+
+    def _update_search_index(self):
+        if self.comm is None:
+            self.search_index_autoupdate.stop()
+            return False
+        return self.search_index.update() > 0
+
+    def _observe_page_visibility(self, change):
+        if change["new"]:
+            self.autoupdate.wake()
+            self.statistics.autoupdate.resume()
+            self.throughput.autoupdate.resume()
+        else:
+            self.statistics.autoupdate.pause()
+            self.throughput.autoupdate.pause()
+
+    def start_autoupdate(
+        self, update_interval=10, statistics_interval=None, search_index_interval=60
+    ):
+        """Update the list every `update_interval` seconds, less often while idle.
+
+        The statistics and the throughput are updated every `statistics_interval`
+        seconds, by default at the same pace as the list. The processes modified in the
+        meantime are added to the search index every `search_index_interval` seconds."""
+        self.autoupdate.start(interval=update_interval)
+        if self.search_index is not None:
+            self.search_index_autoupdate.start(interval=search_index_interval)
+        self.statistics.autoupdate.start(
+            interval=statistics_interval or update_interval
+        )
+        self.throughput.autoupdate.start(
+            interval=statistics_interval or update_interval
+        )
 
-    def start_autoupdate(self, update_interval=10):
-        update_state = threading.Thread(target=self._follow, args=(update_interval,))
-        update_state.start()
+    def stop_autoupdate(self):
+        self.autoupdate.stop()
+        self.search_index_autoupdate.stop()
+        self.statistics.autoupdate.stop()
+        self.throughput.autoupdate.stop()
+
+    def close(self):
+        # A query that is running may schedule another one before it finishes.
+        while self._requery_timer is not None:
+            timer, self._requery_timer = self._requery_timer, None
+            timer.cancel()
+            if timer is not threading.current_thread():
+                timer.join()
+        self.stop_autoupdate()
+        self.statistics.close()
+        self.throughput.close()
+        self._page_visibility.close()
+        super().close()
 
 
 class RunningCalcJobOutputWidget(ipw.VBox):
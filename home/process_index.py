@@ -0,0 +1,226 @@
+"""Local full-text index of the processes of an AiiDA profile.
+
+The index is a SQLite database with an FTS5 table next to the AiiDA configuration,
+so that searching needs neither the AiiDA database nor any external service. Indexing
+all processes of a profile may take long, so the index is built offline with::
+
+    python -m home.process_index --rebuild
+
+and then kept up to date incrementally with the modification times of the processes.
+"""
+
+import argparse
+import datetime
+import pathlib
+import re
+import sqlite3
+import threading
+
+from aiida import get_profile, load_profile, orm
+from aiida.manage import get_config
+
+INDEXED_COLUMNS = ("process_label", "description", "extras")
+
+
+def _search_query(text):
+    """Translate free text into an FTS5 query matching all words as prefixes."""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text))
+
+
+def _format_extras(extras):
+    """Return the searchable text of the extras, skipping the internal ones of AiiDA."""
+    return " ".join(
+        f"{key} {value}"
+        for key, value in (extras or {}).items()
+        if not key.startswith("_") and isinstance(value, (str, int, float))
+    )
+
+
+class ProcessSearchIndex:
+    """Full-text index over the process labels, descriptions and extras of processes.
+
+    path (str or Path): Location of the SQLite database, by default a file in the AiiDA
+    configuration folder named after the current profile.
+
+    An index is empty until it is built with `rebuild`, and `update` does not index
+    anything before.
+    """
+
+    def __init__(self, path=None):
+        profile = get_profile()
+        if path is None:
+            path = pathlib.Path(get_config().dirpath) / (
+                f"process_index_{profile.name}.sqlite"
+            )
+        self.path = pathlib.Path(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS processes "
+                f"USING fts5({', '.join(INDEXED_COLUMNS)})"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)"
+            )
+        if self._get_state("profile") != profile.uuid:
+            self._clear()
+
+    def _get_state(self, key):
+        row = self._connection.execute(
+            "SELECT value FROM state WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _set_state(self, key, value):
+        self._connection.execute(
+            "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    @property
+    def is_built(self):
+        with self._lock:
+            return self._get_state("built") is not None
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT count(*) FROM processes"
+            ).fetchone()
+        return count
+
+    def _clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM processes")
+            self._connection.execute("DELETE FROM state")
+            self._set_state("profile", get_profile().uuid)
+
+    def rebuild(self, batch_size=1000):
+        """Index all processes from scratch and return their number."""
+        self._clear()
+        with self._lock, self._connection:
+            count = self._index_modified(batch_size)
+            self._set_state("built", datetime.datetime.now().isoformat())
+        return count
+
+    def update(self, batch_size=1000):
+        """Index the processes modified since the last update and return their number.
+
+        Processes deleted from the profile are removed from the index as well, at most
+        `batch_size` indexed processes are checked per update, see `_prune`. Nothing is
+        done before the index is built."""
+        with self._lock, self._connection:
+            if self._get_state("built") is None:
+                return 0
+            count = self._index_modified(batch_size)
+            self._prune(batch_size)
+        return count
+
+    def _index_modified(self, batch_size):
+        """Index the processes modified since the last indexed modification time."""
+        last_mtime = self._get_state("mtime")
+        query_builder = orm.QueryBuilder().append(
+            orm.ProcessNode,
+            filters={}
+            if last_mtime is None
+            else {"mtime": {">=": datetime.datetime.fromisoformat(last_mtime)}},
+            project=[
+                "id",
+                "mtime",
+                "attributes.process_label",
+                "description",
+                "extras",
+            ],
+        )
+        count = 0
+        for pk, mtime, process_label, description, extras in query_builder.iterall(
+            batch_size=batch_size
+        ):
+            self._connection.execute("DELETE FROM processes WHERE rowid = ?", (pk,))
+            self._connection.execute(
+                "INSERT INTO processes (rowid, process_label, description, extras) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    pk,
+                    process_label or "",
+                    description or "",
+                    _format_extras(extras),
+                ),
+            )
+            if last_mtime is None or mtime.isoformat() > last_mtime:
+                last_mtime = mtime.isoformat()
+            count += 1
+        if last_mtime is not None:
+            self._set_state("mtime", last_mtime)
+        return count
+
+    def _prune(self, batch_size):
+        """Remove the deleted processes among the next `batch_size` indexed ones.
+
+        Deleted processes leave no trace to query, so the indexed pks are compared with
+        the pks in the same range of the database. Every update checks the range
+        following the one of the previous update, and starts over after the last one.
+        Until they are pruned, deleted processes are found by a search, but they are
+        not shown since the shown processes are queried from the database."""
+        cursor = int(self._get_state("prune_cursor") or 0)
+        pks = [
+            pk
+            for (pk,) in self._connection.execute(
+                "SELECT rowid FROM processes WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (cursor, batch_size),
+            )
+        ]
+        if pks:
+            existing = set(
+                orm.QueryBuilder()
+                .append(
+                    orm.ProcessNode,
+                    filters={"id": {"and": [{">=": pks[0]}, {"<=": pks[-1]}]}},
+                    project="id",
+                )
+                .all(flat=True)
+            )
+            self._connection.executemany(
+                "DELETE FROM processes WHERE rowid = ?",
+                [(pk,) for pk in pks if pk not in existing],
+            )
+        cursor = pks[-1] if len(pks) == batch_size else 0
+        self._set_state("prune_cursor", str(cursor))
+
+    def search(self, text, limit=100):
+        """Return the pks of the processes matching all words of `text`, best first."""
+        query = _search_query(text)
+        if not query:
+            return []
+        with self._lock:
+            return [
+                pk
+                for (pk,) in self._connection.execute(
+                    "SELECT rowid FROM processes WHERE processes MATCH ? "
+                    "ORDER BY rank LIMIT ?",
+                    (query, limit),
+                )
+            ]
+
+    def close(self):
+        self._connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", help="AiiDA profile, the default one if omitted.")
+    parser.add_argument("--path", help="Location of the index database.")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Index all processes from scratch."
+    )
+    args = parser.parse_args(argv)
+
+    load_profile(args.profile)
+    index = ProcessSearchIndex(args.path)
+    count = index.rebuild() if args.rebuild or not index.is_built else index.update()
+    print(f"Indexed {count} processes in {index.path}.")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
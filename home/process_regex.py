@@ -0,0 +1,177 @@
+"""Matching of process descriptions with regular expressions.
+
+The regular expressions are narrowed down to SQL LIKE filters on their literal
+fragments where possible. The PostgreSQL database can also match the regular
+expressions that mean the same to Python, see `is_portable_regex`, the others are
+matched in Python.
+"""
+
+import re
+
+from aiida import get_profile
+
+
+def _skip_regex_set(pattern, index):
+    """Return the index of the "]" closing the character set opened at `index`."""
+    index += 1
+    if pattern.startswith("^", index):
+        index += 1
+    if pattern.startswith("]", index):
+        index += 1
+    while index < len(pattern) and pattern[index] != "]":
+        index += 2 if pattern[index] == "\\" else 1
+    return index
+
+
+def _skip_regex_group(pattern, index):
+    """Return the index of the ")" closing the group opened at `index`."""
+    depth = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 1
+        elif char == "[":
+            index = _skip_regex_set(pattern, index)
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                break
+        index += 1
+    return index
+
+
+def regex_literal_fragments(pattern):
+    """Return the literal fragments that any match of the regular expression must contain.
+
+    The second return value tells whether `pattern` is a plain literal that is fully
+    described by the fragments. A (None, False) result means that no fragment could be
+    extracted safely, e.g. because of alternations or inline flags."""
+    fragments = [""]
+    is_literal = True
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "|" or pattern.startswith("(?", index):
+            return None, False
+        if char == "\\" and index + 1 < len(pattern):
+            escaped = pattern[index + 1]
+            index += 1
+            if escaped.isalnum():
+                # Character classes, anchors and back references.
+                fragments.append("")
+                is_literal = False
+            else:
+                fragments[-1] += escaped
+        elif char in "*?{":
+            # The preceding character is optional.
+            fragments[-1] = fragments[-1][:-1]
+            fragments.append("")
+            is_literal = False
+            if char == "{":
+                closing = pattern.find("}", index)
+                index = len(pattern) if closing < 0 else closing
+        elif char in "([":
+            # Groups and sets are skipped altogether, they could be optional or ambiguous.
+            if char == "(":
+                index = _skip_regex_group(pattern, index)
+            else:
+                index = _skip_regex_set(pattern, index)
+            fragments.append("")
+            is_literal = False
+        elif char in ".^$+":
+            fragments.append("")
+            is_literal = False
+        else:
+            fragments[-1] += char
+        index += 1
+    return [fragment for fragment in fragments if fragment], is_literal
+
+
+def _escape_like(value):
+    """Escape the wildcard characters of a SQL LIKE pattern."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def description_like_filters(description_contains):
+    """Return QueryBuilder filters that narrow processes down by their description.
+
+    The second return value tells whether the filters select exactly the processes
+    whose description matches the regular expression `description_contains`, or whether
+    the results still have to be filtered in Python."""
+    if not description_contains:
+        return {}, True
+
+    re.compile(description_contains)  # Raise on invalid regular expressions.
+    fragments, is_literal = regex_literal_fragments(description_contains)
+    if not fragments:
+        return {}, False
+
+    filters = {
+        "and": [
+            {"description": {"like": f"%{_escape_like(fragment)}%"}}
+            for fragment in fragments
+        ]
+    }
+    # The LIKE operator of SQLite is case insensitive, so an exact match there
+    # still requires the regular expression to be applied in Python.
+    is_exact = is_literal and get_profile().storage_backend == "core.psql_dos"
+    return filters, is_exact
+
+
+def remaining_description_regex(description_contains):
+    """Return the regular expression that the descriptions of the processes selected
+    by `description_like_filters` must still be matched with, None if the filters are exact.
+
+    The process list matches it in the database where possible, see
+    `regex_in_database`, everything else in Python."""
+    _, is_exact = description_like_filters(description_contains)
+    return None if is_exact else re.compile(description_contains)
+
+
+def matches_description(regex, description):
+    return bool(regex.search("" if description is None else str(description)))
+
+
+# Repetition counts accepted by PostgreSQL, which does not take counts above 255.
+_PORTABLE_REGEX_COUNT = re.compile(r"\{(\d{1,3})(,(\d{1,3})?)?\}")
+
+
+def is_portable_regex(pattern):
+    """Return whether the regular expression means the same to Python and PostgreSQL.
+
+    Only literals, the common operators, groups without flags, sets without escapes or
+    classes and the escapes of the digit, space and word characters are accepted. The
+    word boundary `\\b`, for example, is a backspace in PostgreSQL."""
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            escaped = pattern[index + 1 : index + 2]
+            if escaped.isalnum() and escaped not in "dDsSwW":
+                return False
+            index += 1
+        elif pattern.startswith("(?", index) and not pattern.startswith("(?:", index):
+            return False
+        elif char == "[":
+            end = _skip_regex_set(pattern, index)
+            if any(special in pattern[index + 1 : end] for special in "\\["):
+                return False
+            index = end
+        elif char == "{":
+            count = _PORTABLE_REGEX_COUNT.match(pattern, index)
+            if count is None or any(
+                int(value) > 255 for value in count.group(1, 3) if value
+            ):
+                return False
+            index = count.end() - 1
+        index += 1
+    return True
+
+
+def regex_in_database(description_regex):
+    """Return whether the database can match the regular expression like Python."""
+    return get_profile().storage_backend == "core.psql_dos" and is_portable_regex(
+        description_regex.pattern
+    )
@@ -0,0 +1,453 @@
+"""Statistics of the processes of an AiiDA profile, shown as panels of the process list.
+
+The panels count the processes per state, label and exit status, count the processes
+created and finished per hour or day, and find the calculation jobs that stopped
+changing. The counting is done by aggregate queries of the database where possible.
+"""
+
+import collections
+import copy
+import datetime
+
+import ipywidgets as ipw
+import sqlalchemy as sa
+from aiida import get_profile, orm
+from aiida.common import timezone
+from aiida.common.utils import str_timedelta
+from jinja2 import Template
+
+from home.process_regex import matches_description, regex_in_database
+from home.widgets import AutoupdateWidgetMixin
+
+TERMINATED_PROCESS_STATES = ("finished", "excepted", "killed")
+
+THROUGHPUT_BUCKETS = {
+    "hour": datetime.timedelta(hours=1),
+    "day": datetime.timedelta(days=1),
+}
+
+# Number of the most recent hours or days counted and shown by the throughput chart.
+THROUGHPUT_MAX_BUCKETS = 720
+
+
+def _truncate_time(value, unit):
+    """Truncate a datetime to the start of its hour or day in UTC."""
+    value = value.astimezone(datetime.timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+    return value.replace(hour=0) if unit == "day" else value
+
+
+def _count_by_time(query_builder, tag, attribute, unit, since=None):
+    """Return the number of results of the query per hour or day of the `attribute` time.
+
+    Only the times not earlier than `since` are counted, if given. PostgreSQL truncates
+    the times with `date_trunc` and counts them with GROUP BY. Other storage backends
+    fall back to truncating the projected times in Python."""
+    query_builder.add_projection(tag, attribute)
+    if get_profile().storage_backend == "core.psql_dos":
+        try:
+            query = query_builder._impl.get_query(query_builder.as_dict()).query
+        except AttributeError:
+            pass
+        else:
+            column = query.order_by(None).column_descriptions[0]["expr"]
+            if since is not None:
+                query = query.filter(column >= since)
+            bucket = sa.func.date_trunc(unit, sa.func.timezone("UTC", column))
+            grouped = query.order_by(None).with_entities(bucket, sa.func.count())
+            return {
+                value.replace(tzinfo=datetime.timezone.utc): count
+                for value, count in grouped.group_by(bucket).all()
+            }
+    return dict(
+        collections.Counter(
+            _truncate_time(value, unit)
+            for (value,) in query_builder.iterall(batch_size=1000)
+            if since is None or value >= since
+        )
+    )
+
+
+def _count_by(query_builder, tag, attributes, description_regex=None):
+    """Return the number of results of the query for each value of every attribute in
+    `attributes`, keyed by the attribute.
+
+    The counting is done by the database with GROUP BY on the SQLAlchemy query that the
+    QueryBuilder generates. Only the results whose description is matched by
+    `description_regex` are counted, if given, which the database does where it can,
+    see `regex_in_database`. Otherwise the attributes of all results are projected at
+    once and counted in Python. Storage backends without SQLAlchemy queries fall back
+    to one count query per distinct value."""
+    in_database = description_regex is None or regex_in_database(description_regex)
+    query_builder.add_projection(tag, list(attributes))
+    try:
+        built = query_builder._impl.get_query(query_builder.as_dict())
+    except AttributeError:
+        built = None
+
+    if built is not None and in_database:
+        query = built.query.order_by(None)
+        if description_regex is not None:
+            description = built.tag_to_alias[tag].description
+            query = query.filter(description.regexp_match(description_regex.pattern))
+        counts = {}
+        for attribute, column in zip(attributes, query.column_descriptions):
+            grouped = query.with_entities(column["expr"], sa.func.count())
+            counts[attribute] = dict(grouped.group_by(column["expr"]).all())
+        return counts
+
+    if description_regex is None:
+        counts = {attribute: {} for attribute in attributes}
+        for attribute in attributes:
+            distinct = copy.deepcopy(query_builder)
+            distinct.add_projection(tag, attribute)
+            for (value,) in distinct.distinct().iterall():
+                counted = copy.deepcopy(query_builder)
+                counted.add_filter(tag, {attribute: {"==": value}})
+                counts[attribute][value] = counted.count()
+        return counts
+
+    query_builder.add_projection(tag, [*attributes, "description"])
+    counters = {attribute: collections.Counter() for attribute in attributes}
+    for *values, description in query_builder.iterall(batch_size=1000):
+        if matches_description(description_regex, description):
+            for attribute, value in zip(attributes, values):
+                counters[attribute][value] += 1
+    return {attribute: dict(counter) for attribute, counter in counters.items()}
+
+
+PROCESS_STATISTICS_TEMPLATE = Template(
+    """
+    <style>
+        .process-statistics { display: flex; gap: 40px; }
+        .process-statistics table { border: none; }
+        .process-statistics td { padding: 0px 10px; border: none; }
+        .process-statistics th { border: none; border-bottom: 1px solid black; }
+    </style>
+    <div class="process-statistics">
+    {% for title, counts in groups %}
+        <table>
+            <thead>
+                <tr><th>{{ title }}</th><th>Count</th></tr>
+            </thead>
+            <tbody>
+            {% for value, count in counts %}
+                <tr><td>{{ value }}</td><td>{{ count }}</td></tr>
+            {% endfor %}
+            </tbody>
+        </table>
+    {% endfor %}
+    </div>
+    """
+)
+
+
+class ProcessStatisticsWidget(AutoupdateWidgetMixin, ipw.HTML):
+    """Numbers of processes per state, process label and exit status.
+
+    The counts are computed by aggregate queries of the database on the query builder
+    returned by `get_query_builder`, which must tag the processes with "process". If
+    `get_description_regex` returns a regular expression, only the processes whose
+    description it matches are counted, see `_count_by`."""
+
+    GROUPS = (
+        ("Process state", "attributes.process_state"),
+        ("Process label", "attributes.process_label"),
+        ("Exit status", "attributes.exit_status"),
+    )
+
+    def __init__(self, get_query_builder, get_description_regex=None, **kwargs):
+        self.get_query_builder = get_query_builder
+        self.get_description_regex = get_description_regex
+        self.counts = {}
+        super().__init__(**kwargs)
+
+    def update(self, _=None):
+        """Count the processes and return whether any of the counts has changed."""
+        previous = self.counts
+        description_regex = (
+            self.get_description_regex() if self.get_description_regex else None
+        )
+        counts = _count_by(
+            self.get_query_builder(),
+            "process",
+            [attribute for _, attribute in self.GROUPS],
+            description_regex,
+        )
+        self.counts = {title: counts[attribute] for title, attribute in self.GROUPS}
+        self.value = self._render()
+        return self.counts != previous
+
+    def _render(self):
+        groups = [
+            (
+                title,
+                [
+                    ("-" if value is None else value, count)
+                    for value, count in sorted(
+                        counts.items(), key=lambda item: item[1], reverse=True
+                    )
+                ],
+            )
+            for title, counts in self.counts.items()
+        ]
+        return PROCESS_STATISTICS_TEMPLATE.render(groups=groups)
+
+
+PROCESS_THROUGHPUT_TEMPLATE = Template(
+    """
+    <style>
+        .process-throughput { display: flex; align-items: flex-end; height: 150px; }
+        .process-throughput-bucket {
+            display: flex; flex: 1; align-items: flex-end; gap: 1px; height: 100%;
+            max-width: 24px; min-width: 2px; border-bottom: 1px solid black;
+        }
+        .process-throughput-bucket div { flex: 1; }
+    </style>
+    <div>
+        <span style="color: #3498db">&#9632;</span> Created
+        <span style="color: #27ae60">&#9632;</span> Finished
+        ({{ first }} to {{ last }}, UTC)
+    </div>
+    <div class="process-throughput">
+    {% for bucket, created, finished in buckets %}
+        <div class="process-throughput-bucket"
+            title="{{ bucket }}: {{ created }} created, {{ finished }} finished">
+            <div style="height: {{ 100 * created / maximum }}%; background: #3498db"></div>
+            <div style="height: {{ 100 * finished / maximum }}%; background: #27ae60"></div>
+        </div>
+    {% endfor %}
+    </div>
+    """
+)
+
+
+class ProcessThroughputWidget(AutoupdateWidgetMixin, ipw.VBox):
+    """Numbers of processes created and finished per hour or day.
+
+    The processes are the ones of the query builder returned by `get_query_builder`,
+    which must tag them with "process". The database counts them per creation time
+    and, for terminated processes, per last modification time, which is when they
+    finished. Only the last `THROUGHPUT_MAX_BUCKETS` hours or days are counted and
+    shown, however far back the processes go."""
+
+    def __init__(self, get_query_builder, **kwargs):
+        self.get_query_builder = get_query_builder
+        self.counts = {}
+        self.unit = ipw.ToggleButtons(
+            options=[("Per hour", "hour"), ("Per day", "day")], value="day"
+        )
+        self.unit.observe(self.update, names=["value"])
+        self.chart = ipw.HTML()
+        super().__init__(children=[self.unit, self.chart], **kwargs)
+
+    def update(self, _=None):
+        """Count the processes and return whether any of the counts has changed."""
+        previous = self.counts
+        unit = self.unit.value
+        since = (
+            _truncate_time(timezone.now(), unit)
+            - (THROUGHPUT_MAX_BUCKETS - 1) * THROUGHPUT_BUCKETS[unit]
+        )
+        finished = self.get_query_builder()
+        finished.add_filter(
+            "process",
+            {"attributes.process_state": {"in": list(TERMINATED_PROCESS_STATES)}},
+        )
+        self.counts = {
+            "created": _count_by_time(
+                self.get_query_builder(), "process", "ctime", unit, since
+            ),
+            "finished": _count_by_time(finished, "process", "mtime", unit, since),
+        }
+        self.chart.value = self._render(unit)
+        return self.counts != previous
+
+    def _render(self, unit):
+        times = [*self.counts["created"], *self.counts["finished"]]
+        if not times:
+            return "No processes created or finished."
+        # Show the empty buckets between the first one and now as well.
+        buckets = []
+        bucket = min(times)
+        last = _truncate_time(timezone.now(), unit)
+        while bucket <= last:
+            buckets.append(
+                (
+                    bucket.strftime("%Y-%m-%d %H:%M" if unit == "hour" else "%Y-%m-%d"),
+                    self.counts["created"].get(bucket, 0),
+                    self.counts["finished"].get(bucket, 0),
+                )
+            )
+            bucket += THROUGHPUT_BUCKETS[unit]
+        return PROCESS_THROUGHPUT_TEMPLATE.render(
+            buckets=buckets,
+            first=buckets[0][0],
+            last=buckets[-1][0],
+            maximum=max(max(created, finished) for _, created, finished in buckets),
+        )
+
+
+ACTIVE_PROCESS_STATES = ("created", "waiting", "running")
+
+STALLED_CALCJOB_ATTRIBUTES = (
+    "id",
+    "attributes.process_label",
+    "attributes.process_state",
+    "attributes.scheduler_state",
+    "attributes.job_id",
+    "attributes.paused",
+    "ctime",
+    "mtime",
+)
+
+
+def find_stalled_calcjobs(threshold, scheduler_states=None, now=None):
+    """Return the active calculation jobs that did not change for longer than `threshold`.
+
+    A job is stalled if its modification time did not change within the `threshold`
+    timedelta, or if its scheduler state did not. Since AiiDA updates the modification
+    time at every check of the scheduler, jobs that are checked are only found by their
+    scheduler state. It is tracked in `scheduler_states`, a dictionary mapping the pks
+    to pairs of scheduler state and time it was first seen, which the caller keeps
+    across scans. The state of a job is first seen by the first scan that finds it, so
+    a job that was in the same state before is only found once it was tracked for
+    longer than `threshold`.
+
+    All active jobs are projected by a single query. Paused jobs are skipped. The
+    stalled jobs are returned as dictionaries, grouped by the label of their computer
+    and sorted by the time since they last changed, longest first."""
+    now = timezone.now() if now is None else now
+    scheduler_states = {} if scheduler_states is None else scheduler_states
+    query_builder = (
+        orm.QueryBuilder()
+        .append(
+            orm.CalcJobNode,
+            filters={"attributes.process_state": {"in": list(ACTIVE_PROCESS_STATES)}},
+            project=list(STALLED_CALCJOB_ATTRIBUTES),
+            tag="process",
+        )
+        .append(orm.Computer, with_node="process", project="label", tag="computer")
+    )
+    stalled = collections.defaultdict(list)
+    active = set()
+    for *values, computer in query_builder.iterall(batch_size=1000):
+        job = dict(zip(STALLED_CALCJOB_ATTRIBUTES, values))
+        pk = job["id"]
+        active.add(pk)
+        state, since = scheduler_states.get(pk, (None, None))
+        if state != job["attributes.scheduler_state"]:
+            state, since = job["attributes.scheduler_state"], now
+            scheduler_states[pk] = (state, since)
+        unchanged_since = job["mtime"] if state is None else min(job["mtime"], since)
+        if job["attributes.paused"] or now - unchanged_since <= threshold:
+            continue
+        stalled[computer].append(
+            {
+                "pk": pk,
+                "process_label": job["attributes.process_label"],
+                "process_state": job["attributes.process_state"],
+                "scheduler_state": state,
+                "job_id": job["attributes.job_id"],
+                "ctime": job["ctime"],
+                "unchanged_since": unchanged_since,
+            }
+        )
+    # Forget the scheduler states of the jobs that are not active anymore.
+    for pk in set(scheduler_states) - active:
+        del scheduler_states[pk]
+    return {
+        computer: sorted(jobs, key=lambda job: job["unchanged_since"])
+        for computer, jobs in sorted(stalled.items())
+    }
+
+
+STALLED_CALCJOBS_TEMPLATE = Template(
+    """
+    {% for computer, jobs in groups %}
+        <h4>{{ computer }}: {{ jobs | length }} stalled</h4>
+        <table>
+            <thead>
+                <tr>
+                    <th>PK</th><th>Process label</th><th>Process state</th>
+                    <th>Scheduler state</th><th>Job ID</th><th>Unchanged for</th>
+                </tr>
+            </thead>
+            <tbody>
+            {% for job in jobs %}
+                <tr>
+                    <td>
+                        <a target="_blank"
+                            href="{{ path_to_root }}home/process.ipynb?id={{ job.pk }}">
+                            {{ job.pk }}
+                        </a>
+                    </td>
+                    <td>{{ job.process_label }}</td>
+                    <td>{{ job.process_state }}</td>
+                    <td>{{ job.scheduler_state or "-" }}</td>
+                    <td>{{ job.job_id or "-" }}</td>
+                    <td>{{ job.unchanged_for }}</td>
+                </tr>
+            {% endfor %}
+            </tbody>
+        </table>
+    {% else %}
+        No stalled calculation jobs.
+    {% endfor %}
+    """
+)
+
+
+class StalledCalcJobsWidget(AutoupdateWidgetMixin, ipw.VBox):
+    """Active calculation jobs that did not change for longer than a threshold.
+
+    The scheduler states seen by the scans are remembered by the widget. A job stuck in
+    the same scheduler state is found once the scans have seen it in that state for
+    longer than the threshold, however long it was in the state before."""
+
+    def __init__(self, threshold_hours=24, path_to_root="../", **kwargs):
+        self.path_to_root = path_to_root
+        self.stalled = {}
+        self._scheduler_states = {}
+        self.threshold_hours = ipw.BoundedFloatText(
+            value=threshold_hours,
+            min=0,
+            max=24 * 365,
+            description="Unchanged for (hours):",
+            style={"description_width": "initial"},
+        )
+        self.scan_button = ipw.Button(description="Scan", icon="search")
+        self.scan_button.on_click(self.update)
+        self.output = ipw.HTML()
+        super().__init__(
+            children=[ipw.HBox([self.threshold_hours, self.scan_button]), self.output],
+            **kwargs,
+        )
+
+    def update(self, _=None):
+        """Scan the active jobs and return whether the stalled ones have changed."""
+        previous = self.stalled
+        now = timezone.now()
+        self.stalled = find_stalled_calcjobs(
+            datetime.timedelta(hours=self.threshold_hours.value),
+            scheduler_states=self._scheduler_states,
+            now=now,
+        )
+        groups = [
+            (
+                computer,
+                [
+                    {
+                        **job,
+                        "unchanged_for": str_timedelta(now - job["unchanged_since"]),
+                    }
+                    for job in jobs
+                ],
+            )
+            for computer, jobs in self.stalled.items()
+        ]
+        self.output.value = STALLED_CALCJOBS_TEMPLATE.render(
+            groups=groups, path_to_root=self.path_to_root
+        )
+        return self.stalled != previous
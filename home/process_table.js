@@ -0,0 +1,192 @@
+// Front end of the ProcessTableWidget defined in process.py.
+//
+// The kernel sends the rows in a columnar layout: a "reset" message with all rows
+// when the view asks for a snapshot, and "diff" messages with only the inserted,
+// changed and removed rows afterwards. Sorting and scrolling happen here, and only
+// the rows inside the visible part of the viewport are turned into DOM elements.
+// Clicking a row toggles its key in the synced "selection" list.
+
+function formatCell(kind, value) {
+  if (value === null || value === undefined) {
+    return "";
+  }
+  if (kind === "time") {
+    return new Date(value * 1000).toLocaleString();
+  }
+  return String(value);
+}
+
+function compareValues(a, b) {
+  if (a === b) {
+    return 0;
+  }
+  if (a === null || a === undefined) {
+    return 1;
+  }
+  if (b === null || b === undefined) {
+    return -1;
+  }
+  return a < b ? -1 : 1;
+}
+
+function render({ model, el }) {
+  const rows = new Map();
+  let order = [];
+
+  const header = document.createElement("div");
+  header.className = "process-table-header";
+  const body = document.createElement("div");
+  body.className = "process-table-body";
+  const spacer = document.createElement("div");
+  spacer.className = "process-table-spacer";
+  spacer.appendChild(body);
+  const viewport = document.createElement("div");
+  viewport.className = "process-table-viewport";
+  viewport.appendChild(spacer);
+  el.classList.add("process-table");
+  el.append(header, viewport);
+
+  function gridTemplate() {
+    return `repeat(${model.get("columns").length}, minmax(150px, 1fr))`;
+  }
+
+  function sortRows() {
+    const columns = model.get("columns");
+    const index = columns.findIndex(
+      (column) => column.name === model.get("sort_column"),
+    );
+    const sign = model.get("sort_descending") ? -1 : 1;
+    order = Array.from(rows.keys());
+    order.sort((a, b) => {
+      const byColumn =
+        index < 0 ? 0 : compareValues(rows.get(a)[index], rows.get(b)[index]);
+      return sign * (byColumn || compareValues(a, b));
+    });
+  }
+
+  function renderHeader() {
+    header.style.gridTemplateColumns = gridTemplate();
+    header.replaceChildren(
+      ...model.get("columns").map((column) => {
+        const cell = document.createElement("div");
+        cell.className = "process-table-cell";
+        let label = column.label;
+        if (column.name === model.get("sort_column")) {
+          label += model.get("sort_descending") ? " ▼" : " ▲";
+        }
+        cell.textContent = label;
+        cell.addEventListener("click", () => {
+          if (column.name === model.get("sort_column")) {
+            model.set("sort_descending", !model.get("sort_descending"));
+          } else {
+            model.set("sort_column", column.name);
+            model.set("sort_descending", false);
+          }
+          model.save_changes();
+        });
+        return cell;
+      }),
+    );
+  }
+
+  function renderRow(key) {
+    const row = document.createElement("div");
+    row.className = "process-table-row";
+    if (model.get("selection").includes(key)) {
+      row.classList.add("process-table-selected");
+    }
+    row.addEventListener("click", (event) => {
+      if (event.target.tagName === "A") {
+        return;
+      }
+      const selection = model.get("selection");
+      model.set(
+        "selection",
+        selection.includes(key)
+          ? selection.filter((selected) => selected !== key)
+          : [...selection, key],
+      );
+      model.save_changes();
+    });
+    row.style.gridTemplateColumns = gridTemplate();
+    row.style.height = `${model.get("row_height")}px`;
+    const columns = model.get("columns");
+    rows.get(key).forEach((value, index) => {
+      const cell = document.createElement("div");
+      cell.className = "process-table-cell";
+      if (columns[index].kind === "link") {
+        const link = document.createElement("a");
+        link.href = `${model.get("path_to_root")}home/process.ipynb?id=${value}`;
+        link.target = "_blank";
+        link.textContent = formatCell("text", value);
+        cell.appendChild(link);
+      } else {
+        cell.textContent = formatCell(columns[index].kind, value);
+      }
+      row.appendChild(cell);
+    });
+    return row;
+  }
+
+  function renderRows() {
+    const rowHeight = model.get("row_height");
+    const first = Math.floor(viewport.scrollTop / rowHeight);
+    const count = Math.ceil(viewport.clientHeight / rowHeight) + 1;
+    spacer.style.height = `${order.length * rowHeight}px`;
+    body.style.transform = `translateY(${first * rowHeight}px)`;
+    body.replaceChildren(...order.slice(first, first + count).map(renderRow));
+  }
+
+  let renderScheduled = false;
+  function scheduleRender() {
+    if (!renderScheduled) {
+      renderScheduled = true;
+      requestAnimationFrame(() => {
+        renderScheduled = false;
+        renderRows();
+      });
+    }
+  }
+
+  function onMessage(content) {
+    if (content.type === "reset") {
+      rows.clear();
+    }
+    const { keys, columns } = content.upsert;
+    keys.forEach((key, index) => {
+      rows.set(
+        key,
+        columns.map((column) => column[index]),
+      );
+    });
+    content.remove.forEach((key) => rows.delete(key));
+    sortRows();
+    scheduleRender();
+  }
+
+  function onSortChange() {
+    renderHeader();
+    sortRows();
+    scheduleRender();
+  }
+
+  model.on("msg:custom", onMessage);
+  model.on("change:sort_column", onSortChange);
+  model.on("change:sort_descending", onSortChange);
+  model.on("change:columns", onSortChange);
+  model.on("change:selection", scheduleRender);
+  viewport.addEventListener("scroll", scheduleRender);
+
+  renderHeader();
+  model.send({ type: "snapshot" });
+
+  return () => {
+    model.off("msg:custom", onMessage);
+    model.off("change:sort_column", onSortChange);
+    model.off("change:sort_descending", onSortChange);
+    model.off("change:columns", onSortChange);
+    model.off("change:selection", scheduleRender);
+  };
+}
+
+export default { render };
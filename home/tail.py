@@ -0,0 +1,408 @@
+"""Incremental reading of growing files, to follow the output of running calculations.
+
+Files are read either locally, or on remote computers through AiiDA transports.
+"""
+
+import collections
+import contextlib
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from aiida.common.escaping import escape_for_bash
+
+
+class FileTail:
+    """Read the lines appended to a file since the previous read.
+
+    A byte offset into the file is kept, so that a read costs as much as the output
+    that was appended, regardless of the size of the file. A file that was truncated,
+    or replaced by another one as when it is rotated, is read again from its beginning.
+    Only complete lines are returned, the beginning of an incomplete last line is kept
+    until the rest of it has been written.
+
+    path (str): Location of the file.
+
+    encoding (str): Encoding of the file, bytes that cannot be decoded are replaced.
+    """
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self.offset = 0
+        # Whether the last read started over from the beginning of the file.
+        self.restarted = False
+        self._identity = None
+        self._partial = b""
+
+    def _stat(self):
+        """Return the identity and the size of the file, None if it does not exist."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_dev, stat.st_ino), stat.st_size
+
+    def _read(self, offset, size):
+        """Return at most `size` bytes of the file starting at `offset`."""
+        with open(self.path, "rb") as fobj:
+            fobj.seek(offset)
+            return fobj.read(size)
+
+    def read(self, max_bytes=None):
+        """Return the complete lines appended since the previous read.
+
+        The lines keep their line endings, as the ones returned by `readlines`. If more
+        than `max_bytes` bytes were appended, only the lines within the last `max_bytes`
+        bytes are read."""
+        self.restarted = False
+        stat = self._stat()
+        if stat is None:
+            return []
+        identity, size = stat
+        if identity != self._identity or size < self.offset:
+            self.restarted = self._identity is not None
+            self._identity = identity
+            self.offset = 0
+            self._partial = b""
+        if size == self.offset:
+            return []
+
+        start = self.offset
+        skipped = max_bytes is not None and size - start > max_bytes
+        if skipped:
+            # The byte before the skipped part tells whether a line starts there.
+            start = size - max_bytes - 1
+        appended = self._read(start, size - start)
+        self.offset = start + len(appended)
+        if skipped:
+            # The line cut by skipping is dropped, along with any incomplete line.
+            newline = appended.find(b"\n")
+            data = b"" if newline < 0 else appended[newline + 1 :]
+        else:
+            data = self._partial + appended
+        end = data.rfind(b"\n") + 1
+        self._partial = data[end:]
+        if not end:
+            return []
+        return [
+            f"{line.decode(self.encoding, errors='replace')}\n"
+            for line in data[: end - 1].split(b"\n")
+        ]
+
+
+class _PooledTransport:
+    __slots__ = ("last_used", "lock", "transport")
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.lock = threading.Lock()
+        self.last_used = None
+
+
+class TransportPool:
+    """Open AiiDA transports, shared by everything that reads remote files.
+
+    One transport is opened per computer and kept open, so that following the output
+    of any number of calculations on a cluster uses a single connection. A transport is
+    not used again sooner than its safe interval, the same limit the AiiDA engine
+    respects when connecting to the computer."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Pooled transports keyed by the UUID of the computer.
+        self._transports = {}
+
+    @contextlib.contextmanager
+    def request(self, computer):
+        """Yield the open transport of `computer`.
+
+        Yield None instead if the transport is in use, or was used less than its safe
+        interval ago. Errors getting or opening the transport are raised, and so is any
+        error while it is used, after which the transport is closed and dropped. The next
+        request gets a new transport of the computer."""
+        with self._lock:
+            if computer.uuid not in self._transports:
+                self._transports[computer.uuid] = _PooledTransport(
+                    computer.get_transport()
+                )
+            pooled = self._transports[computer.uuid]
+        transport = pooled.transport
+        if not pooled.lock.acquire(blocking=False):
+            yield None
+            return
+        try:
+            now = time.monotonic()
+            if (
+                pooled.last_used is not None
+                and now - pooled.last_used < transport.get_safe_open_interval()
+            ):
+                yield None
+                return
+            pooled.last_used = now
+            if not transport.is_open:
+                transport.open()
+            try:
+                yield transport
+            except Exception:
+                # Closing a transport whose connection dropped may fail as well.
+                with contextlib.suppress(Exception):
+                    transport.close()
+                with self._lock:
+                    if self._transports.get(computer.uuid) is pooled:
+                        del self._transports[computer.uuid]
+                raise
+        finally:
+            pooled.lock.release()
+
+    def close(self):
+        """Close all transports."""
+        with self._lock:
+            transports, self._transports = self._transports, {}
+        for pooled in transports.values():
+            with pooled.lock:
+                if pooled.transport.is_open:
+                    pooled.transport.close()
+
+
+TRANSPORT_POOL = TransportPool()
+
+
+class RemoteFileTail(FileTail):
+    """Read the lines appended to a file on a computer, through its AiiDA transport.
+
+    Like `FileTail`, only the appended bytes are transferred. The transport is taken
+    from `pool`, by default the `TRANSPORT_POOL` shared by all remote tails. Reads while
+    the transport is busy return no lines, the following reads catch up. Errors of the
+    transport are raised, and the read can be tried again.
+
+    computer (orm.Computer): Computer the file is on.
+    """
+
+    def __init__(self, path, computer, pool=None, encoding="utf-8"):
+        super().__init__(path, encoding=encoding)
+        self.computer = computer
+        self.pool = TRANSPORT_POOL if pool is None else pool
+        self._transport = None
+
+    def read(self, max_bytes=None):
+        with self.pool.request(self.computer) as transport:
+            if transport is None:
+                self.restarted = False
+                return []
+            self._transport = transport
+            try:
+                return super().read(max_bytes=max_bytes)
+            finally:
+                self._transport = None
+
+    def _stat(self):
+        # The inode and the size are the first and the sixth fields of `ls -in`.
+        retval, stdout, _ = self._transport.exec_command_wait(
+            f"ls -inL {escape_for_bash(self.path)}"
+        )
+        if retval != 0:
+            return None
+        fields = stdout.split()
+        try:
+            return int(fields[0]), int(fields[5])
+        except (IndexError, ValueError):
+            # Not the output of a regular file, nothing can be read.
+            return None
+
+    def _read(self, offset, size):
+        _, stdout, _ = self._transport.exec_command_wait_bytes(
+            f"tail -c +{offset + 1} {escape_for_bash(self.path)} | head -c {size}"
+        )
+        return stdout
+
+
+class OutputBuffer:
+    """The last lines of an output, bounded in number and in total size.
+
+    max_lines (int): Number of lines kept, all if None.
+
+    max_bytes (int): Total size in bytes of the lines kept, encoded in UTF-8, unbounded
+    if None.
+    """
+
+    def __init__(self, max_lines=None, max_bytes=None):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._lines = collections.deque()
+        self._sizes = collections.deque()
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def text(self):
+        return "".join(self._lines)
+
+    def clear(self):
+        self._lines.clear()
+        self._sizes.clear()
+        self.size = 0
+
+    def extend(self, lines):
+        """Append `lines`, drop the oldest lines beyond the limits and return their number."""
+        for line in lines:
+            self._lines.append(line)
+            self._sizes.append(len(line.encode()))
+            self.size += self._sizes[-1]
+        return self.trim()
+
+    def trim(self):
+        """Drop the oldest lines beyond the limits and return their number."""
+        dropped = 0
+        while self._lines and (
+            (self.max_lines is not None and len(self._lines) > self.max_lines)
+            or (self.max_bytes is not None and self.size > self.max_bytes)
+        ):
+            self._lines.popleft()
+            self.size -= self._sizes.popleft()
+            dropped += 1
+        return dropped
+
+
+# Events of inotify(7) on a directory that change the files in it.
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+INOTIFY_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def _inotify_watch(directory):
+    """Return a non-blocking inotify file descriptor watching `directory`.
+
+    Return None where inotify is not available, on other systems than Linux or when
+    the limits of the system are reached."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directory), INOTIFY_MASK) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class FileWatcher:
+    """Call a function from a background thread whenever a file changes.
+
+    The directory of the file is watched with inotify where available, so that changes
+    are noticed within milliseconds and a file that does not change costs no CPU time.
+    Elsewhere, the size and modification time of the file are polled.
+
+    path (str): Location of the file, which does not need to exist yet.
+
+    callback (callable): Function called without arguments after the file changed.
+
+    poll_interval (float): Number of seconds between two checks of the file when
+    inotify is not available.
+    """
+
+    def __init__(self, path, callback, poll_interval=1.0):
+        self.path = path
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self._thread = None
+        self._stop = threading.Event()
+        # Writing to the pipe interrupts the wait for inotify events.
+        self._wake = None
+        self._orphaned_wake = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start watching the file, with inotify if possible, and return whether it is used."""
+        if self.is_running:
+            return self._wake is not None
+        self._stop.clear()
+        fd = _inotify_watch(os.path.dirname(self.path) or ".")
+        if fd is None:
+            self._wake = None
+            self._thread = threading.Thread(target=self._poll, daemon=True)
+        else:
+            self._wake = os.pipe()
+            self._thread = threading.Thread(
+                target=self._watch, args=(fd, self._wake), daemon=True
+            )
+        self._thread.start()
+        return fd is not None
+
+    def stop(self):
+        """Stop watching and wait for the background thread to finish."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        wake, self._wake = self._wake, None
+        if wake is not None:
+            os.write(wake[1], b"\0")
+        if thread is threading.current_thread():
+            # Stopped by the callback, the thread closes the pipe once it returns.
+            self._orphaned_wake = wake
+            return
+        if thread is not None:
+            thread.join()
+        if wake is not None:
+            os.close(wake[0])
+            os.close(wake[1])
+
+    def _watch(self, fd, wake):
+        name = os.fsencode(os.path.basename(self.path))
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd, wake[0]], [], [])
+                if fd not in ready:
+                    continue
+                data = os.read(fd, 64 * 1024)
+                offset = 0
+                changed = False
+                while offset < len(data):
+                    _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                    offset += INOTIFY_EVENT.size
+                    changed |= data[offset : offset + length].rstrip(b"\0") == name
+                    offset += length
+                if changed and not self._stop.is_set():
+                    self.callback()
+        finally:
+            os.close(fd)
+            if self._orphaned_wake is wake:
+                self._orphaned_wake = None
+                os.close(wake[0])
+                os.close(wake[1])
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _poll(self):
+        signature = self._signature()
+        while not self._stop.wait(self.poll_interval):
+            previous, signature = signature, self._signature()
+            if signature != previous:
+                self.callback()
@@ -1,12 +1,17 @@
 """AiiDAlab basic widgets."""
 
-from threading import Timer
+import pathlib
+import threading
+import traceback
+import warnings
 
+import anywidget
 import ipywidgets as ipw
 import traitlets
 from aiidalab.app import AppRemoteUpdateStatus as AppStatus
 from aiidalab.config import AIIDALAB_REGISTRY
 
+from .tail import OutputBuffer
 from .themes import ThemeDefault as Theme
 
 
@@ -38,7 +43,7 @@ class _StatusWidgetMixin(traitlets.HasTraits):
         self.value = value
 
         # Start new timer that will clear the value after the specified interval.
-        self._clear_timer = Timer(clear_after, self._clear_value)
+        self._clear_timer = threading.Timer(clear_after, self._clear_value)
         self._clear_timer.start()
 
 
@@ -156,6 +161,87 @@ class Spinner(ipw.HTML):
             self.value = ""
 
 
+class PageVisibilityWidget(anywidget.AnyWidget):
+    """Invisible widget that reports whether the browser tab showing it is visible."""
+
+    _esm = """
+    export default {
+        render({ model }) {
+            const update = () => {
+                model.set("visible", document.visibilityState === "visible");
+                model.save_changes();
+            };
+            document.addEventListener("visibilitychange", update);
+            update();
+            return () => document.removeEventListener("visibilitychange", update);
+        },
+    };
+    """
+
+    visible = traitlets.Bool(True).tag(sync=True)
+
+    def __init__(self, **kwargs):
+        super().__init__(layout={"display": "none"}, **kwargs)
+
+
+class LogViewWidget(anywidget.AnyWidget):
+    """Scrolling view of a log that receives only the lines appended to it.
+
+    Only the last `max_lines` lines, and no more than `max_bytes` bytes, are kept. The
+    browser receives the whole log only when a view requests it, and afterwards only the
+    appended lines along with the number of old lines to drop. The view follows the end
+    of the log, unless it has been scrolled up."""
+
+    _esm = pathlib.Path(__file__).parent / "log_view.js"
+    _css = pathlib.Path(__file__).parent / "log_view.css"
+
+    description = traitlets.Unicode("").tag(sync=True)
+    placeholder = traitlets.Unicode("").tag(sync=True)
+    max_lines = traitlets.Int(10000)
+    max_bytes = traitlets.Int(10 * 1024 * 1024)
+
+    def __init__(self, **kwargs):
+        self.output = OutputBuffer()
+        super().__init__(**kwargs)
+        self.output.max_lines = self.max_lines
+        self.output.max_bytes = self.max_bytes
+        self.on_msg(self._handle_message)
+
+    @property
+    def value(self):
+        """Text of the lines that are kept."""
+        return self.output.text()
+
+    def write_lines(self, lines):
+        """Append complete `lines`, each ending with a newline."""
+        if not lines:
+            return
+        previous = len(self.output)
+        dropped = self.output.extend(lines)
+        if dropped >= previous:
+            # Nothing shown before is kept.
+            self._send_output()
+        else:
+            self.send({"type": "append", "text": "".join(lines), "drop": dropped})
+
+    def clear(self):
+        self.output.clear()
+        self._send_output()
+
+    @traitlets.observe("max_lines", "max_bytes")
+    def _observe_limits(self, change):
+        setattr(self.output, change["name"], change["new"])
+        if self.output.trim():
+            self._send_output()
+
+    def _send_output(self):
+        self.send({"type": "reset", "text": self.output.text()})
+
+    def _handle_message(self, _, content, __):
+        if content.get("type") == "snapshot":
+            self._send_output()
+
+
 class LogOutputWidget(ipw.VBox):
     value = traitlets.Unicode()
     template = traitlets.Unicode()
@@ -187,3 +273,115 @@ class LogOutputWidget(ipw.VBox):
             self._output.value = (
                 self.template.format(text=self.value) if self.value else ""
             )
+
+
+class AutoupdateScheduler:
+    """Call a function periodically in a background thread.
+
+    The function returns whether anything has changed. While nothing changes, the
+    interval is stretched by the `backoff` factor up to `max_interval` (eight times
+    `interval` by default), and any change resets it to `interval`. The scheduler can
+    be started, paused, resumed and stopped at any time, and starting it again while
+    running has no effect. A call that raises is reported with a warning and counts as
+    one without changes, the function is called again at the next interval."""
+
+    def __init__(self, callback, interval=10.0, max_interval=None, backoff=2.0):
+        self.callback = callback
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.current_interval = interval
+
+        self._thread = None
+        self._paused = False
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_paused(self):
+        return self._paused
+
+    def start(self, interval=None):
+        """Start calling the function, optionally with a new base interval."""
+        with self._lock:
+            if interval is not None:
+                self.interval = interval
+            self.current_interval = self.interval
+            if self.is_running:
+                self._wake.set()
+                return
+            self._paused = False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop calling the function and wait for the background thread to finish."""
+        with self._lock:
+            self._stop.set()
+            self._wake.set()
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def pause(self):
+        """Skip the calls until the scheduler is resumed."""
+        self._paused = True
+
+    def resume(self):
+        """Resume a paused scheduler and call the function right away."""
+        self._paused = False
+        self.wake()
+
+    def wake(self):
+        """Call the function right away and reset the interval."""
+        self.current_interval = self.interval
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            if not self._paused:
+                try:
+                    changed = self.callback()
+                except Exception:
+                    warnings.warn(
+                        f"WARNING: The autoupdate of {self.callback.__name__!r} failed and is tried again later:\n{traceback.format_exc()}",
+                        stacklevel=2,
+                    )
+                    changed = False
+                max_interval = self.max_interval or 8 * self.interval
+                self.current_interval = (
+                    self.interval
+                    if changed
+                    else min(self.current_interval * self.backoff, max_interval)
+                )
+            self._wake.wait(timeout=self.current_interval)
+
+
+class AutoupdateWidgetMixin:
+    """Refresh a widget periodically with its own `autoupdate` scheduler.
+
+    This is a mixin class for widgets with an `update` method that returns whether
+    anything has changed, so that each widget can be refreshed at its own pace. The
+    scheduler is stopped when the widget is closed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.autoupdate = AutoupdateScheduler(self._autoupdate)
+        super().__init__(*args, **kwargs)
+
+    def _autoupdate(self):
+        if self.comm is None:
+            self.autoupdate.stop()
+            return False
+        return self.update()
+
+    def close(self):
+        self.autoupdate.stop()
+        super().close()
@@ -6,6 +6,8 @@ from aiida.common import LinkType
 from aiida.workflows.arithmetic.multiply_add import MultiplyAddWorkChain
 from plumpy import ProcessState
 
+from home import process_index
+
 pytest_plugins = ["aiida.manage.tests.pytest_fixtures"]
 
 
@@ -58,6 +60,27 @@ def generate_calc_job_node(aiida_localhost):
     return _generate_calc_job_node
 
 
+class _BackendWithoutSqlAlchemyQuery:
+    def __init__(self, backend_query_builder):
+        self._backend_query_builder = backend_query_builder
+
+    def __getattr__(self, name):
+        if name == "get_query":
+            raise AttributeError(name)
+        return getattr(self._backend_query_builder, name)
+
+
+@pytest.fixture
+def without_sqlalchemy_query():
+    """Hide the SQLAlchemy query of a ``QueryBuilder``, like storage backends without one."""
+
+    def _without_sqlalchemy_query(query_builder):
+        query_builder._impl = _BackendWithoutSqlAlchemyQuery(query_builder._impl)
+        return query_builder
+
+    return _without_sqlalchemy_query
+
+
 @pytest.fixture
 def aiida_local_code_bash(aiida_local_code_factory):
     """Return a ``Code`` configured for the bash executable."""
@@ -76,3 +99,11 @@ def multiply_add_completed_workchain(aiida_local_code_bash):
     }
     _, process = engine.run_get_node(MultiplyAddWorkChain, **inputs)
     return process
+
+
+@pytest.fixture
+def search_index(tmp_path):
+    """A ``ProcessSearchIndex`` stored in a temporary file."""
+    index = process_index.ProcessSearchIndex(tmp_path / "index.sqlite")
+    yield index
+    index.close()
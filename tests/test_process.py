@@ -1,16 +1,33 @@
+import concurrent.futures
+import csv
+import datetime
+import json
 import sys
+import time
 import types
 
 import ipywidgets as ipw
 import pytest
+import traitlets
 from aiida import orm
+from aiida.common import timezone
+from aiida.tools.graph.deletions import delete_nodes
+from plumpy import ProcessState
 
 from home import node_preview
 from home import process as home_process
+from home.tail import RemoteFileTail
 
 pytestmark = pytest.mark.usefixtures("aiida_profile_clean")
 
 
+@pytest.fixture(autouse=True)
+def close_widgets():
+    """Close the widgets of a test, which stops their timers and background threads."""
+    yield
+    ipw.Widget.close_all()
+
+
 @pytest.fixture
 def capture_display(monkeypatch):
     displayed = []
@@ -122,6 +139,107 @@ def test_calcjob_output_widget(generate_calc_job_node):
     assert widget.calculation == process
 
 
+def test_calcjob_output_widget_sends_appended_lines(
+    generate_calc_job_node, tmp_path, monkeypatch, capture_display
+):
+    # An absolute output file name takes precedence over the remote folder.
+    path = tmp_path / "aiida.out"
+    process = generate_calc_job_node(
+        inputs={"parameters": orm.Int(1)}, attributes={"output_filename": str(path)}
+    )
+    widget = home_process.CalcJobOutputWidget(calculation=process, max_lines=3)
+    sent = []
+    monkeypatch.setattr(widget, "send", sent.append)
+
+    path.write_text("one\ntwo\n")
+    widget.update()
+    assert sent.pop() == {"type": "reset", "text": "one\ntwo\n"}
+
+    with path.open("a") as fobj:
+        fobj.write("three\nfour\nfi")
+    widget.update()
+    assert sent.pop() == {"type": "append", "text": "three\nfour\n", "drop": 1}
+    assert widget.value == "two\nthree\nfour\n"
+
+    widget.update()
+    assert not sent
+
+    widget._handle_message(widget, {"type": "snapshot"}, [])
+    assert sent.pop() == {"type": "reset", "text": "two\nthree\nfour\n"}
+
+    widget.max_lines = 1
+    assert sent.pop() == {"type": "reset", "text": "four\n"}
+
+    path.write_text("new\n")
+    widget.update()
+    assert widget.value == "new\n"
+    assert not capture_display
+
+
+def test_calcjob_output_widget_watches_local_output(generate_calc_job_node, tmp_path):
+    path = tmp_path / "aiida.out"
+    process = generate_calc_job_node(
+        inputs={"parameters": orm.Int(1)}, attributes={"output_filename": str(path)}
+    )
+    process.set_process_state(ProcessState.RUNNING)
+    widget = home_process.CalcJobOutputWidget(calculation=process)
+    widget.update()
+    assert widget._watcher.is_running
+
+    path.write_text("written\n")
+    deadline = time.monotonic() + 5
+    while widget.value != "written\n" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert widget.value == "written\n"
+
+    process.set_process_state(ProcessState.FINISHED)
+    widget.update()
+    assert widget._watcher is None
+    widget.close()
+
+
+def test_calcjob_output_widget_reads_remote_output(
+    generate_calc_job_node, tmp_path, monkeypatch
+):
+    path = tmp_path / "aiida.out"
+    path.write_text("remote\n")
+    process = generate_calc_job_node(
+        inputs={"parameters": orm.Int(1)}, attributes={"output_filename": str(path)}
+    )
+    # The local transport stands in for the transport of a remote computer.
+    monkeypatch.setattr(home_process.CalcJobOutputWidget, "_is_local", lambda _: False)
+    widget = home_process.CalcJobOutputWidget(calculation=process)
+    widget.update()
+    assert isinstance(widget._tail, RemoteFileTail)
+    assert widget.value == "remote\n"
+
+
+def test_calcjob_output_widget_retries_after_transport_errors(
+    generate_calc_job_node, tmp_path, monkeypatch
+):
+    path = tmp_path / "aiida.out"
+    path.write_text("remote\n")
+    process = generate_calc_job_node(
+        inputs={"parameters": orm.Int(1)}, attributes={"output_filename": str(path)}
+    )
+    monkeypatch.setattr(home_process.CalcJobOutputWidget, "_is_local", lambda _: False)
+    widget = home_process.CalcJobOutputWidget(calculation=process)
+    placeholder = widget.placeholder
+
+    def raise_error(self):
+        raise OSError("Connection refused")
+
+    with monkeypatch.context() as context:
+        context.setattr(RemoteFileTail, "_stat", raise_error)
+        widget.update()
+    assert "Connection refused" in widget.placeholder
+    assert widget.value == ""
+
+    widget.update()
+    assert widget.placeholder == placeholder
+    assert widget.value == "remote\n"
+
+
 def test_running_calcjob_output_widget(generate_calc_job_node):
     process = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
 
@@ -181,3 +299,1121 @@ def test_process_list_widget_renders_empty_results(multiply_add_completed_workch
         f"home/process.ipynb?id={multiply_add_completed_workchain.pk}"
         not in widget.table.value
     )
+
+
+def test_process_list_widget_paginates_with_keyset_cursors(generate_calc_job_node):
+    processes = [
+        generate_calc_job_node(inputs={"parameters": orm.Int(i)}) for i in range(3)
+    ]
+    newest, middle, oldest = (process.pk for process in reversed(processes))
+
+    widget = home_process.ProcessListWidget(page_size=2)
+    assert widget.output.value == "2 processes shown"
+    assert f"home/process.ipynb?id={newest}" in widget.table.value
+    assert f"home/process.ipynb?id={middle}" in widget.table.value
+    assert widget._previous_page_button.disabled
+    assert not widget._next_page_button.disabled
+
+    widget.next_page()
+    assert widget.output.value == "1 processes shown"
+    assert f"home/process.ipynb?id={oldest}" in widget.table.value
+    assert f"home/process.ipynb?id={middle}" not in widget.table.value
+    assert widget._next_page_button.disabled
+
+    widget.previous_page()
+    assert widget.output.value == "2 processes shown"
+    assert f"home/process.ipynb?id={newest}" in widget.table.value
+    assert widget._previous_page_button.disabled
+
+
+def test_process_list_widget_jumps_to_date(generate_calc_job_node):
+    process = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    created = process.ctime.date()
+
+    widget = home_process.ProcessListWidget()
+    widget.jump_to_date(created - datetime.timedelta(days=1))
+    assert widget.output.value == "0 processes shown"
+
+    widget.jump_to_date(created)
+    assert f"home/process.ipynb?id={process.pk}" in widget.table.value
+    assert not widget._previous_page_button.disabled
+
+
+def test_process_list_widget_filters_descriptions_in_database(
+    generate_calc_job_node,
+):
+    matching_process = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    matching_process.description = "100% converged_run"
+
+    other_process = generate_calc_job_node(inputs={"parameters": orm.Int(2)})
+    other_process.description = "100 converged runs"
+
+    # With a single process per page, the match is only found if the database filters.
+    widget = home_process.ProcessListWidget(page_size=1)
+    widget.description_contains = "100% converged_run"
+    widget.update()
+
+    assert widget.output.value == "1 processes shown"
+    assert f"home/process.ipynb?id={matching_process.pk}" in widget.table.value
+    assert widget._next_page_button.disabled
+
+
+@pytest.mark.parametrize(
+    ("description_contains", "in_database"),
+    [
+        (r"calc-\d", True),
+        # The word boundary is a backspace in PostgreSQL, it is matched in Python.
+        (r"\bcalc-\d", False),
+    ],
+)
+def test_process_list_widget_pages_descriptions_matched_by_regex(
+    generate_calc_job_node, description_contains, in_database
+):
+    matching_process = generate_calc_job_node(inputs={"parameters": orm.Int(0)})
+    matching_process.description = "calc-1"
+    for value in range(1, 4):
+        other_process = generate_calc_job_node(inputs={"parameters": orm.Int(value)})
+        other_process.description = "calc-x"
+
+    # The matching process is the oldest, beyond the first page of the newest ones.
+    widget = home_process.ProcessListWidget(
+        page_size=2, description_contains=description_contains
+    )
+
+    assert widget.output.value == "1 processes shown"
+    assert widget.matching.value == "(1 matching processes)"
+    assert f"home/process.ipynb?id={matching_process.pk}" in widget.table.value
+    assert widget._next_page_button.disabled
+    query = home_process._process_pk_query(
+        widget._get_query_builder(),
+        "process",
+        description_regex=widget._get_description_regex(),
+    )
+    assert (query is not None) == in_database
+
+
+def test_process_list_widget_delta_refresh(generate_calc_job_node, monkeypatch):
+    finished = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    leaving = generate_calc_job_node(inputs={"parameters": orm.Int(2)})
+
+    widget = home_process.ProcessListWidget(
+        delta_refresh=True, process_states=["finished"]
+    )
+    assert widget.output.value == "2 processes shown"
+
+    full_loads = []
+    load_page = widget._load_page
+    monkeypatch.setattr(
+        widget, "_load_page", lambda: full_loads.append(1) or load_page()
+    )
+
+    finished.description = "modified after the first load"
+    leaving.set_process_state(ProcessState.EXCEPTED)
+    created = generate_calc_job_node(inputs={"parameters": orm.Int(3)})
+    widget.update()
+
+    assert not full_loads
+    assert widget.output.value == "2 processes shown"
+    assert "modified after the first load" in widget.table.value
+    assert f"home/process.ipynb?id={created.pk}" in widget.table.value
+    assert f"home/process.ipynb?id={leaving.pk}" not in widget.table.value
+
+
+def test_process_list_widget_delta_refresh_keeps_database_order(
+    generate_calc_job_node,
+):
+    processes = {}
+    for label in ("a", "b", "c"):
+        processes[label] = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+        processes[label].base.attributes.set("process_label", label)
+    widget = home_process.ProcessListWidget(
+        delta_refresh=True, page_size=2, sort_by="process_label", sort_descending=False
+    )
+    assert widget._get_shown_pks() == [processes["a"].pk, processes["b"].pk]
+
+    processes["c"].base.attributes.set("process_label", "0")
+    widget.update()
+    assert widget._get_shown_pks() == [processes["c"].pk, processes["a"].pk]
+    assert list(widget._page_cache) == [
+        processes["c"].pk,
+        processes["a"].pk,
+        processes["b"].pk,
+    ]
+
+
+def test_process_list_widget_delta_refresh_trims_page_cache(generate_calc_job_node):
+    for i in range(2):
+        generate_calc_job_node(inputs={"parameters": orm.Int(i)})
+    widget = home_process.ProcessListWidget(delta_refresh=True, page_size=2)
+
+    for i in range(5):
+        created = generate_calc_job_node(inputs={"parameters": orm.Int(i)})
+        widget.update()
+    # The page and the first process of the next page.
+    assert len(widget._page_cache) == 3
+    assert widget._get_shown_pks()[0] == created.pk
+    assert not widget._next_page_button.disabled
+
+
+def test_process_list_widget_delta_refresh_drops_departed_processes(
+    generate_calc_job_node, monkeypatch
+):
+    processes = [
+        generate_calc_job_node(inputs={"parameters": orm.Int(i)}) for i in range(2)
+    ]
+    widget = home_process.ProcessListWidget(delta_refresh=True)
+    assert widget.output.value == "2 processes shown"
+
+    delete_nodes([processes[0].pk], dry_run=False)
+    widget.update()
+    assert widget._get_shown_pks() == [processes[1].pk]
+
+    # The remaining process is no longer created in the last `past_days`.
+    later = timezone.now() + datetime.timedelta(days=widget.past_days + 1)
+    monkeypatch.setattr(home_process.timezone, "now", lambda: later)
+    widget.update()
+    assert widget.output.value == "0 processes shown"
+
+
+def test_process_table_widget_sends_row_differences(monkeypatch):
+    widget = home_process.ProcessTableWidget(
+        columns=[{"name": "pk", "label": "PK", "kind": "link"}]
+    )
+    sent = []
+    monkeypatch.setattr(widget, "send", sent.append)
+
+    widget.set_rows({1: [1], 2: [2]})
+    assert sent.pop() == {
+        "type": "diff",
+        "upsert": {"keys": [1, 2], "columns": [[1, 2]]},
+        "remove": [],
+    }
+
+    widget.set_rows({1: [1], 2: [2]})
+    assert not sent
+
+    widget.set_rows({2: [20], 3: [3]})
+    assert sent.pop() == {
+        "type": "diff",
+        "upsert": {"keys": [2, 3], "columns": [[20, 3]]},
+        "remove": [1],
+    }
+
+    widget._handle_message(widget, {"type": "snapshot"}, [])
+    assert sent.pop() == {
+        "type": "reset",
+        "upsert": {"keys": [2, 3], "columns": [[20, 3]]},
+        "remove": [],
+    }
+
+
+def test_process_list_widget_data_grid(generate_calc_job_node):
+    process = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    process.description = "shown in the grid"
+
+    widget = home_process.ProcessListWidget(data_grid=True)
+    assert widget.children[-1] is widget.grid
+    assert widget.output.value == "1 processes shown"
+
+    row = widget.grid.rows[process.pk]
+    assert row[0] == process.pk
+    assert row[1] == process.ctime.timestamp()
+    assert row[-1] == "shown in the grid"
+
+
+def test_process_list_widget_autoupdate_stops_on_close(
+    multiply_add_completed_workchain,
+):
+    widget = home_process.ProcessListWidget()
+    widget.start_autoupdate(update_interval=0.01)
+    assert widget.autoupdate.is_running
+
+    widget._page_visibility.visible = False
+    assert not widget._autoupdate()
+
+    widget.close()
+    assert not widget.autoupdate.is_running
+
+
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("sort_by", ["pk", "process_label", "exit_status"])
+def test_process_list_widget_sorts_in_database(
+    generate_calc_job_node, sort_by, descending
+):
+    processes = []
+    for label, exit_status in [("b", 0), ("a", None), ("c", 1), ("a", 2), (None, 3)]:
+        process = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+        if label is not None:
+            process.base.attributes.set("process_label", label)
+        if exit_status is None:
+            process.base.attributes.delete("exit_status")
+        else:
+            process.base.attributes.set("exit_status", exit_status)
+        processes.append(process)
+
+    widget = home_process.ProcessListWidget(
+        page_size=1, sort_by=sort_by, sort_descending=descending
+    )
+    shown = []
+    while True:
+        shown.extend(widget._page_cache)
+        shown = list(dict.fromkeys(shown))
+        if widget._next_page_button.disabled:
+            break
+        widget.next_page()
+
+    # Every process is shown once, in the order of the database.
+    expected = (
+        orm.QueryBuilder()
+        .append(orm.ProcessNode, tag="process", project="id")
+        .order_by(
+            {"process": home_process._ProcessOrder(sort_by, descending).order_by()}
+        )
+        .all(flat=True)
+    )
+    assert shown == expected
+    assert sorted(shown) == sorted(process.pk for process in processes)
+
+    # Going back visits the same pages in reverse.
+    widget.previous_page()
+    assert shown[-2] in widget._page_cache
+
+
+def test_process_list_widget_rejects_unknown_sort_column(
+    multiply_add_completed_workchain,
+):
+    widget = home_process.ProcessListWidget()
+    with pytest.raises(traitlets.TraitError):
+        widget.sort_by = "description"
+
+
+def test_process_list_widget_statistics(generate_calc_job_node):
+    for exit_status in (0, 0, 1):
+        process = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+        process.set_exit_status(exit_status)
+    generate_calc_job_node(inputs={"parameters": orm.Int(2)}).set_process_state(
+        ProcessState.EXCEPTED
+    )
+
+    widget = home_process.ProcessListWidget(process_states=["finished"])
+    assert widget.statistics.counts == {
+        "Process state": {"finished": 3},
+        "Process label": {None: 3},
+        "Exit status": {0: 2, 1: 1},
+    }
+    assert "<th>Exit status</th>" in widget.statistics.value
+
+    widget.process_states = []
+    assert widget.statistics.update()
+    assert widget.statistics.counts["Process state"] == {"finished": 3, "excepted": 1}
+    assert not widget.statistics.update()
+
+
+@pytest.mark.parametrize(
+    ("description_contains", "in_database"),
+    [(r"calc-\d", True), (r"\bcalc-\d", False)],
+)
+def test_process_list_widget_statistics_apply_description_regex(
+    generate_calc_job_node, monkeypatch, description_contains, in_database
+):
+    for description, exit_status in (("calc-1", 0), ("calc-x", 1), ("calc-2", 1)):
+        process = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+        process.description = description
+        process.set_exit_status(exit_status)
+
+    # The LIKE filter of the database selects all three processes.
+    widget = home_process.ProcessListWidget(description_contains=description_contains)
+    assert widget.output.value == "2 processes shown"
+    assert widget.statistics.counts["Exit status"] == {0: 1, 1: 1}
+    assert widget.statistics.counts["Process state"] == {"finished": 2}
+
+    # The processes are read at most once to count all groups.
+    scans = []
+    iterall = orm.QueryBuilder.iterall
+    monkeypatch.setattr(
+        orm.QueryBuilder,
+        "iterall",
+        lambda self, **kwargs: scans.append(1) or iterall(self, **kwargs),
+    )
+    widget.statistics.update()
+    assert len(scans) == (0 if in_database else 1)
+
+
+@pytest.mark.parametrize("file_format", ["csv", "jsonl"])
+def test_export_processes_streams_batches(
+    generate_calc_job_node, tmp_path, file_format
+):
+    processes = [
+        generate_calc_job_node(inputs={"parameters": orm.Int(i)}) for i in range(3)
+    ]
+    processes[0].description = "first, with a comma"
+
+    path = tmp_path / f"processes.{file_format}"
+    progress = []
+    query_builder = (
+        orm.QueryBuilder()
+        .append(orm.ProcessNode, tag="process")
+        .order_by({"process": {"id": "asc"}})
+    )
+    count = home_process.export_processes(
+        query_builder,
+        path,
+        file_format=file_format,
+        batch_size=2,
+        on_progress=progress.append,
+    )
+
+    assert count == 3
+    assert progress == [2, 3]
+    with open(path) as fobj:
+        if file_format == "csv":
+            rows = list(csv.DictReader(fobj))
+        else:
+            rows = [json.loads(line) for line in fobj]
+    assert [int(row["pk"]) for row in rows] == [process.pk for process in processes]
+    assert rows[0]["description"] == "first, with a comma"
+    assert rows[0]["ctime"] == processes[0].ctime.isoformat()
+
+
+def test_process_list_widget_export(generate_calc_job_node, tmp_path):
+    process = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+
+    widget = home_process.ProcessListWidget()
+    widget.export.file_format.value = "jsonl"
+    assert widget.export.path.value == "~/processes.jsonl"
+    widget.export.path.value = str(tmp_path / "processes.jsonl")
+    widget.export.export(wait=True)
+
+    assert widget.export.message.value.startswith("Exported 1 processes")
+    assert widget.export.progress.value == 1
+    with open(tmp_path / "processes.jsonl") as fobj:
+        assert json.loads(fobj.readline())["uuid"] == process.uuid
+
+
+def test_process_list_widget_export_does_not_overwrite(
+    generate_calc_job_node, tmp_path, monkeypatch
+):
+    generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / "processes.csv").write_text("kept")
+
+    widget = home_process.ProcessListWidget()
+    widget.export.export(wait=True)
+    assert "exists" in widget.export.message.value
+    assert (tmp_path / "processes.csv").read_text() == "kept"
+
+    widget.export.overwrite.value = True
+    widget.export.export(wait=True)
+    assert widget.export.message.value.startswith("Exported 1 processes")
+    assert (tmp_path / "processes.csv").read_text().startswith("pk,")
+
+
+def test_process_list_widget_export_applies_description_regex(
+    generate_calc_job_node, tmp_path
+):
+    for description in ("calc-1", "calc-x", "calc-2"):
+        generate_calc_job_node(
+            inputs={"parameters": orm.Int(1)}
+        ).description = description
+
+    widget = home_process.ProcessListWidget(description_contains=r"calc-\d")
+    widget.export.file_format.value = "jsonl"
+    widget.export.path.value = str(tmp_path / "processes.jsonl")
+    widget.export.export(wait=True)
+
+    assert widget.export.message.value.startswith("Exported 2 processes")
+    with open(tmp_path / "processes.jsonl") as fobj:
+        assert sorted(json.loads(line)["description"] for line in fobj) == [
+            "calc-1",
+            "calc-2",
+        ]
+
+
+class _FakeController:
+    """Process controller that answers requests only when told to."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.futures = {}
+        self.max_pending = 0
+
+    def _request(self, pk, **_):
+        future = concurrent.futures.Future()
+        self.futures[pk] = future
+        pending = sum(not future.done() for future in self.futures.values())
+        self.max_pending = max(self.max_pending, pending)
+        response = self.responses.get(pk)
+        if isinstance(response, Exception):
+            future.set_exception(response)
+        elif response is not None:
+            future.set_result(response)
+        return future
+
+    kill_process = pause_process = play_process = _request
+
+
+def test_control_processes_reports_each_process(generate_calc_job_node):
+    processes = [generate_calc_job_node() for _ in range(5)]
+    for process in processes[:4]:
+        process.set_process_state(ProcessState.RUNNING)
+    running = [process.pk for process in processes[:4]]
+    controller = _FakeController(
+        {
+            running[0]: True,
+            running[1]: False,
+            running[2]: RuntimeError("boom"),
+        }
+    )
+
+    results = home_process.control_processes(
+        [*running, processes[4].pk, -1],
+        "kill",
+        max_parallel=2,
+        timeout=0.1,
+        controller=controller,
+    )
+
+    assert results == {
+        running[0]: "done",
+        running[1]: "refused",
+        running[2]: "failed: boom",
+        running[3]: "timed out",
+        processes[4].pk: "already terminated",
+        -1: "not found",
+    }
+    assert controller.max_pending <= 2
+
+
+def test_process_list_widget_actions(generate_calc_job_node, monkeypatch):
+    process = generate_calc_job_node()
+    process.set_process_state(ProcessState.WAITING)
+    requests = []
+
+    def control_processes(pks, action, **_):
+        requests.append((pks, action))
+        return dict.fromkeys(pks, "done")
+
+    monkeypatch.setattr(home_process, "control_processes", control_processes)
+
+    widget = home_process.ProcessListWidget(data_grid=True)
+    widget.update()
+    widget.actions.children[0].children[1].click()
+    assert widget.actions.selection == [process.pk]
+    assert widget.actions.pks.value == str(process.pk)
+
+    widget.grid.selection = []
+    assert widget.actions.pks.value == ""
+    widget.actions.pks.value = f"{process.pk}, x"
+    assert widget.grid.selection == [process.pk]
+
+    widget.actions.run("pause", wait=True)
+    assert requests == [([process.pk], "pause")]
+    assert "Pause requests processed for 1 out of 1" in widget.actions.message.value
+    assert f"{process.pk}</a>" in widget.actions.results.value
+
+
+def test_process_actions_widget_confirms_kill(monkeypatch):
+    requests = []
+
+    def control_processes(pks, action, **_):
+        requests.append((pks, action))
+        return dict.fromkeys(pks, "done")
+
+    monkeypatch.setattr(home_process, "control_processes", control_processes)
+    widget = home_process.ProcessActionsWidget()
+    widget.selection = [1, 2, 3]
+
+    widget.buttons["kill"].click()
+    assert widget.confirm_message.value == "Kill 3 processes?"
+    assert widget.confirmation.layout.display is None
+    widget.cancel()
+    assert widget.confirmation.layout.display == "none"
+
+    # Changing the selection cancels the confirmation.
+    widget.buttons["kill"].click()
+    widget.selection = [1]
+    widget.confirm()
+    assert not requests
+
+    widget.buttons["kill"].click()
+    widget.confirm_button.click()
+    widget._thread.join()
+    assert requests == [([1], "kill")]
+
+    # Playing processes is not confirmed.
+    widget.buttons["play"].click()
+    widget._thread.join()
+    assert requests[-1] == ([1], "play")
+
+
+def test_process_list_widget_filters_computer_code_and_exit_status(
+    generate_calc_job_node, aiida_localhost
+):
+    code = orm.InstalledCode(
+        computer=aiida_localhost, filepath_executable="/bin/true", label="add"
+    )
+    with_code = generate_calc_job_node(inputs={"code": code})
+    failed = generate_calc_job_node()
+    failed.set_exit_status(300)
+    other = orm.Computer(
+        label="cluster", hostname="cluster", transport_type="core.local"
+    )
+    other.scheduler_type = "core.direct"
+    other.store()
+
+    widget = home_process.ProcessListWidget()
+
+    def shown():
+        widget.update()
+        return set(widget._get_shown_pks())
+
+    assert shown() == {with_code.pk, failed.pk}
+    widget.code = "add"
+    assert shown() == {with_code.pk}
+    widget.code = f"add@{aiida_localhost.label}"
+    assert shown() == {with_code.pk}
+    widget.code = "add@cluster"
+    assert shown() == set()
+
+    widget.code = ""
+    widget.computer = "cluster"
+    assert shown() == set()
+    widget.computer = aiida_localhost.label
+    widget.failed = True
+    assert shown() == {failed.pk}
+
+    widget.failed = False
+    widget.exit_status = 0
+    assert shown() == {with_code.pk}
+    assert widget.statistics.counts
+
+
+def test_process_list_widget_tree_view(multiply_add_completed_workchain):
+    workchain = multiply_add_completed_workchain
+    called = sorted(node.pk for node in workchain.called)
+
+    widget = home_process.ProcessListWidget(tree_view=True)
+    assert widget.children[-1] is widget.tree
+    assert widget.tree.roots == [workchain.pk]
+
+    root = widget.tree.node(workchain.pk)
+    assert not root.toggle.disabled
+    assert not root.called.children
+    root.toggle.click()
+    assert sorted(node.pk for node in root.called.children) == called
+    assert all(node.toggle.disabled for node in root.called.children)
+    assert f"{called[0]}</a>" in widget.tree.node(called[0]).row.value
+
+    # Expanded processes stay expanded across updates.
+    widget.update()
+    assert widget.tree.node(workchain.pk).is_expanded
+    root.toggle.click()
+    assert root.called.layout.display == "none"
+
+    widget.tree_view = False
+    assert widget.children[-1] is widget.table
+    assert set(widget._get_shown_pks()) == {workchain.pk, *called}
+
+
+@pytest.mark.parametrize("sqlalchemy_query", [True, False])
+def test_root_process_pks(
+    multiply_add_completed_workchain, without_sqlalchemy_query, sqlalchemy_query
+):
+    def query_builder():
+        query_builder = orm.QueryBuilder().append(orm.ProcessNode, tag="process")
+        if not sqlalchemy_query:
+            without_sqlalchemy_query(query_builder)
+        return query_builder
+
+    assert home_process._root_process_pks(query_builder(), "process", limit=10) == [
+        multiply_add_completed_workchain.pk
+    ]
+    assert home_process._count_root_processes(query_builder(), "process") == 1
+
+
+def test_process_list_widget_counts_like_the_shown_processes(
+    multiply_add_completed_workchain, generate_calc_job_node
+):
+    generate_calc_job_node().description = "calc-1"
+    generate_calc_job_node().description = "calc-x"
+
+    widget = home_process.ProcessListWidget(tree_view=True)
+    assert widget.matching_count == 3
+    widget.description_contains = r"calc-\d"
+    widget.update()
+    assert widget.matching_count == 1
+    widget.tree_view = False
+    assert widget.matching_count == 1
+    widget.description_contains = ""
+    widget.update()
+    assert widget.matching_count == len(multiply_add_completed_workchain.called) + 3
+
+
+def test_process_list_widget_counts_only_when_filters_change(
+    generate_calc_job_node, monkeypatch
+):
+    generate_calc_job_node()
+    widget = home_process.ProcessListWidget(delta_refresh=True)
+    counts = []
+    count_matching = widget._count_matching
+    monkeypatch.setattr(
+        widget, "_count_matching", lambda: counts.append(1) or count_matching()
+    )
+
+    generate_calc_job_node()
+    widget.update()
+    assert not counts
+    assert widget.output.value == "2 processes shown"
+
+    widget.refresh()
+    assert len(counts) == 1
+    assert widget.matching_count == 2
+    widget.process_states = ["finished"]
+    widget.update()
+    assert len(counts) == 2
+
+
+def test_process_list_widget_renders_only_modified_rows(
+    generate_calc_job_node, monkeypatch
+):
+    processes = [
+        generate_calc_job_node(inputs={"parameters": orm.Int(i)}) for i in range(3)
+    ]
+    # Keep the relative creation times from changing while the test runs.
+    monkeypatch.setattr(
+        home_process,
+        "_format_relative_times",
+        lambda values, _: ["just now"] * len(values),
+    )
+    rendered = []
+    render_row = home_process._render_process_table_row
+
+    def _render_process_table_row(headers, row):
+        rendered.append(row["PK"])
+        return render_row(headers, row)
+
+    monkeypatch.setattr(
+        home_process, "_render_process_table_row", _render_process_table_row
+    )
+
+    widget = home_process.ProcessListWidget()
+    assert len(rendered) == 3
+    table = widget.table.value
+
+    rendered.clear()
+    widget.update()
+    assert rendered == []
+    assert widget.table.value == table
+
+    processes[1].description = "modified"
+    widget.update()
+    assert len(rendered) == 1
+    assert f"id={processes[1].pk}" in rendered[0]
+    assert "modified" in widget.table.value
+
+
+def test_lru_cache_evicts_least_recently_used_items():
+    cache = home_process._LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1
+    cache["c"] = 3
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+
+def test_process_columns_filter_and_format_whole_columns():
+    now = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)
+    processes = home_process._ProcessColumns.from_query_results(
+        {
+            "process": {
+                "id": pk,
+                "ctime": now - datetime.timedelta(minutes=pk),
+                "description": description,
+            }
+        }
+        for pk, description in [(1, "relax"), (2, None), (3, "relax again")]
+    )
+    mapper = home_process.CalculationQueryBuilder().mapper
+
+    relaxations = processes.select(processes.matching("description", "^relax"))
+    assert len(relaxations) == 2
+    assert relaxations["id"] == [1, 3]
+    assert relaxations.format(mapper, "ctime", now) == ["1m ago", "3m ago"]
+
+    columns = relaxations.table(mapper, ["pk", "description"], "../")
+    row = home_process._ProcessRow(columns, 1)
+    assert row["Description"] == "relax again"
+    assert 'href=../home/process.ipynb?id=3 target="_blank">3</a>' in row["PK"]
+
+    empty = processes.select([])
+    assert len(empty) == 0
+    assert empty["id"] == []
+
+
+def test_process_list_widget_counts_and_loads_more(generate_calc_job_node):
+    processes = [
+        generate_calc_job_node(inputs={"parameters": orm.Int(i)}) for i in range(5)
+    ]
+
+    widget = home_process.ProcessListWidget(page_size=2, max_rows=3)
+    assert widget.matching_count == 5
+    assert widget.matching.value == "(5 matching processes)"
+    assert widget.output.value == "2 processes shown"
+    assert not widget._load_more_button.disabled
+
+    widget.load_more()
+    assert widget.output.value == "3 processes shown"
+    assert widget._get_shown_pks() == [process.pk for process in processes[:1:-1]]
+    # The cap is reached, but the next page can still be shown.
+    assert widget._load_more_button.disabled
+    assert not widget._next_page_button.disabled
+
+    widget.next_page()
+    assert widget.output.value == "2 processes shown"
+    assert widget._get_shown_pks() == [processes[1].pk, processes[0].pk]
+    assert widget._load_more_button.disabled
+
+
+def test_process_list_widget_pages_with_query_builder_built_once(
+    generate_calc_job_node, monkeypatch
+):
+    parameters = orm.Int(1).store()
+    processes = [
+        generate_calc_job_node(inputs={"parameters": parameters}) for _ in range(3)
+    ]
+
+    widget = home_process.ProcessListWidget(page_size=1, incoming_node=parameters.uuid)
+    built = []
+    build_query_builder = widget._build_query_builder
+    monkeypatch.setattr(
+        widget,
+        "_build_query_builder",
+        lambda filters: built.append(1) or build_query_builder(filters),
+    )
+    widget.next_page()
+    widget.load_more()
+    widget.previous_page()
+    assert widget._get_shown_pks() == [processes[-1].pk]
+    assert not built
+
+
+def test_process_list_widget_pages_only_after_requery(generate_calc_job_node):
+    processes = [
+        generate_calc_job_node(inputs={"parameters": orm.Int(i)}) for i in range(3)
+    ]
+
+    widget = home_process.ProcessListWidget(page_size=1, requery_delay=0.1)
+    assert not widget._next_page_button.disabled
+
+    # The page of the previous filters cannot be left before the new query ran.
+    widget.past_days = 30
+    assert widget._next_page_button.disabled
+    assert widget._load_more_button.disabled
+    widget.load_more()
+    widget.next_page()
+
+    widget._requery_timer.join()
+    assert widget._get_shown_pks() == [processes[-1].pk]
+    assert not widget._next_page_button.disabled
+
+
+def test_process_list_widget_searches_in_rank_order(
+    generate_calc_job_node, search_index, monkeypatch
+):
+    once = generate_calc_job_node()
+    once.description = "phonons of the silicon crystal"
+    twice = generate_calc_job_node()
+    twice.description = "phonons and more phonons"
+    for _ in range(3):
+        generate_calc_job_node()
+    search_index.rebuild()
+
+    widget = home_process.ProcessListWidget(
+        search_index=search_index, requery_delay=0.1
+    )
+    assert widget.output.value == "5 processes shown"
+
+    # Typing the search queries once it pauses.
+    updates = []
+    update = widget.update
+    with monkeypatch.context() as context:
+        context.setattr(widget, "update", lambda: updates.append(1) or update())
+        for length in range(1, len("phonon") + 1):
+            widget.search = "phonon"[:length]
+        widget._requery_timer.join()
+    assert len(updates) == 1
+    assert widget.output.value == "2 processes shown"
+    assert widget.matching_count == 2
+    assert widget._get_shown_pks() == [twice.pk, once.pk]
+    assert widget._next_page_button.disabled
+
+    # The index is only updated in the background, not by the list.
+    added = generate_calc_job_node()
+    added.description = "phonons again"
+    widget.update()
+    assert widget._get_shown_pks() == [twice.pk, once.pk]
+    assert widget._update_search_index()
+    widget.update()
+    assert set(widget._get_shown_pks()) == {twice.pk, once.pk, added.pk}
+
+    widget.search = ""
+    widget._requery_timer.join()
+    assert widget.output.value == "6 processes shown"
+
+
+def test_process_list_widget_asks_to_build_the_search_index(search_index):
+    widget = home_process.ProcessListWidget(search_index=search_index)
+    assert "--rebuild" in widget._search.placeholder
+
+
+@pytest.mark.parametrize("sqlalchemy_query", [True, False])
+def test_descendant_processes(
+    multiply_add_completed_workchain,
+    monkeypatch,
+    without_sqlalchemy_query,
+    sqlalchemy_query,
+):
+    if not sqlalchemy_query:
+        query_builder = orm.QueryBuilder
+        monkeypatch.setattr(
+            home_process.orm,
+            "QueryBuilder",
+            lambda *args, **kwargs: without_sqlalchemy_query(
+                query_builder(*args, **kwargs)
+            ),
+        )
+    processes = home_process._descendant_processes(multiply_add_completed_workchain)
+    assert sorted(processes["id"]) == sorted(
+        process.pk for process in multiply_add_completed_workchain.called_descendants
+    )
+    assert set(processes["attributes.process_state"]) == {"finished"}
+
+
+def test_timeline_lanes():
+    assert home_process._timeline_lanes([0, 1, 2, 5], [3, 2, 6, 7]) == [0, 1, 1, 0]
+
+
+def test_process_timeline_widget(multiply_add_completed_workchain):
+    home_process.ProcessTimelineWidget()
+
+    widget = home_process.ProcessTimelineWidget(
+        process=multiply_add_completed_workchain
+    )
+    widget.update()
+    for process in multiply_add_completed_workchain.called_descendants:
+        assert f"process.ipynb?id={process.pk}" in widget.value
+    assert widget.value.count("<rect") == len(
+        multiply_add_completed_workchain.called_descendants
+    )
+
+    calculation = multiply_add_completed_workchain.called_descendants[0]
+    descendants = multiply_add_completed_workchain.called_descendants
+    assert home_process._descendant_signature(multiply_add_completed_workchain) == (
+        len(descendants),
+        max(process.mtime for process in descendants),
+    )
+    widget = home_process.ProcessTimelineWidget(process=calculation)
+    assert widget.value == "No processes were called."
+
+
+def test_process_timeline_widget_draws_only_changes(
+    multiply_add_completed_workchain, monkeypatch
+):
+    widget = home_process.ProcessTimelineWidget(
+        process=multiply_add_completed_workchain
+    )
+    queries = []
+    descendant_processes = home_process._descendant_processes
+    monkeypatch.setattr(
+        home_process,
+        "_descendant_processes",
+        lambda process: queries.append(1) or descendant_processes(process),
+    )
+    widget.update()
+    assert not queries
+
+    # A process called by the workflow, or changing its state, changes the signature.
+    signature = home_process._descendant_signature(multiply_add_completed_workchain)
+    monkeypatch.setattr(
+        home_process,
+        "_descendant_signature",
+        lambda _: (signature[0] + 1, signature[1]),
+    )
+    widget.update()
+    assert queries == [1]
+
+
+def test_process_list_presets(tmp_path):
+    path = tmp_path / "presets.json"
+    presets = home_process.ProcessListPresets(path)
+    assert presets.names() == []
+
+    widget = home_process.ProcessListWidget(process_states=["excepted"], past_days=-1)
+    presets.save("excepted", widget._preset_values())
+    presets = home_process.ProcessListPresets(path)
+    assert presets.names() == ["excepted"]
+    assert presets["excepted"]["process_states"] == ["excepted"]
+    assert presets["excepted"]["past_days"] == -1
+
+    presets.delete("excepted")
+    assert "excepted" not in home_process.ProcessListPresets(path)
+
+
+def test_process_list_widget_presets(generate_calc_job_node, tmp_path, monkeypatch):
+    finished = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    excepted = generate_calc_job_node(inputs={"parameters": orm.Int(2)})
+    excepted.set_process_state(ProcessState.EXCEPTED)
+
+    widget = home_process.ProcessListWidget(
+        presets=home_process.ProcessListPresets(tmp_path / "presets.json"),
+        process_states=["finished"],
+    )
+    widget.save_preset("finished")
+    widget.process_states = ["excepted"]
+    widget.save_preset("excepted")
+    assert widget._preset.options == (
+        ("", None),
+        ("excepted", "excepted"),
+        ("finished", "finished"),
+    )
+
+    built = []
+    build_query_builder = widget._build_query_builder
+    monkeypatch.setattr(
+        widget,
+        "_build_query_builder",
+        lambda filters: built.append(1) or build_query_builder(filters),
+    )
+    widget.apply_preset("finished")
+    assert widget.process_states == ["finished"]
+    assert f"process.ipynb?id={finished.pk}" in widget.table.value
+    assert f"process.ipynb?id={excepted.pk}" not in widget.table.value
+
+    # The query builders of the filters are built once.
+    built.clear()
+    widget._get_query_builder()
+    widget.statistics.update()
+    assert not built
+
+    # The results of the views are shown again without querying.
+    widget.apply_preset("excepted")
+    widget.apply_preset("finished")
+    assert widget.process_states == ["finished"]
+    assert widget.matching.value == "(1 matching processes)"
+    assert f"process.ipynb?id={finished.pk}" in widget.table.value
+    assert widget.statistics.counts["Process state"] == {"finished": 1}
+
+    load_page = widget._load_page
+    loads = []
+    monkeypatch.setattr(widget, "_load_page", lambda: loads.append(1) or load_page())
+    widget.apply_preset("excepted")
+    assert not loads
+    assert f"process.ipynb?id={excepted.pk}" in widget.table.value
+
+    widget.preset_ttl = 0
+    widget.apply_preset("finished")
+    assert loads
+    assert widget._preset.value == "finished"
+
+    widget._preset.value = "excepted"
+    assert widget.process_states == ["excepted"]
+    widget.delete_preset("excepted")
+    assert widget._preset.value is None
+
+
+def test_process_list_widget_requeries_once_filters_settle(
+    generate_calc_job_node, monkeypatch
+):
+    finished = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    excepted = generate_calc_job_node(inputs={"parameters": orm.Int(2)})
+    excepted.set_process_state(ProcessState.EXCEPTED)
+
+    widget = home_process.ProcessListWidget(requery_delay=0.1)
+    assert widget.output.value == "2 processes shown"
+
+    updates = []
+    update = widget.update
+    monkeypatch.setattr(widget, "update", lambda: updates.append(1) or update())
+    for past_days in (1, 10, 100):
+        widget.past_days = past_days
+    widget.process_states = ["excepted"]
+    widget._requery_timer.join()
+    assert updates == [1]
+    assert widget._get_shown_pks() == [excepted.pk]
+
+    # The processes queried in the meantime are not queried again.
+    widget.process_states = ["finished"]
+    update()
+    widget._requery_timer.join()
+    assert updates == [1]
+    assert widget._get_shown_pks() == [finished.pk]
+
+
+def test_process_list_widget_discards_outdated_results(
+    generate_calc_job_node, monkeypatch
+):
+    generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    excepted = generate_calc_job_node(inputs={"parameters": orm.Int(2)})
+    excepted.set_process_state(ProcessState.EXCEPTED)
+
+    widget = home_process.ProcessListWidget(requery_delay=0.1)
+    table = widget.table.value
+
+    # The filters change while the page is loaded.
+    load_page = widget._load_page
+
+    def change_filters_while_loading():
+        load_page()
+        widget.process_states = ["excepted"]
+
+    monkeypatch.setattr(widget, "_load_page", change_filters_while_loading)
+    widget.past_days = 30
+    assert widget.update() is False
+    assert widget.table.value == table
+
+    monkeypatch.setattr(widget, "_load_page", load_page)
+    widget._requery_timer.join()
+    assert widget._get_shown_pks() == [excepted.pk]
+
+
+def test_process_list_widget_reports_invalid_regex(generate_calc_job_node):
+    process = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    process.description = "calc-1"
+
+    widget = home_process.ProcessListWidget(requery_delay=0.01)
+    # The regular expression is incomplete while it is typed.
+    widget.description_contains = "calc-["
+    widget._requery_timer.join()
+    assert "Invalid regular expression" in widget.output.value
+    assert widget._autoupdate() is False
+
+    widget.description_contains = "calc-[0-9]"
+    widget._requery_timer.join()
+    assert widget._get_shown_pks() == [process.pk]
+    assert widget.output.value == "1 processes shown"
+
+
+def test_process_list_widget_requeries_filters_changed_during_requery(
+    generate_calc_job_node, monkeypatch
+):
+    generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    excepted = generate_calc_job_node(inputs={"parameters": orm.Int(2)})
+    excepted.set_process_state(ProcessState.EXCEPTED)
+
+    widget = home_process.ProcessListWidget(requery_delay=0.01)
+    count_matching = widget._count_matching
+
+    def change_filters_while_counting():
+        monkeypatch.setattr(widget, "_count_matching", count_matching)
+        widget.process_states = ["excepted"]
+        return count_matching()
+
+    monkeypatch.setattr(widget, "_count_matching", change_filters_while_counting)
+    widget.past_days = 30
+    timer = widget._requery_timer
+    timer.join()
+    assert widget._requery_timer is not timer
+    widget._requery_timer.join()
+    assert widget._get_shown_pks() == [excepted.pk]
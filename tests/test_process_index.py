@@ -0,0 +1,70 @@
+import pytest
+from aiida.tools.graph.deletions import delete_nodes
+
+from home import process_index
+
+pytestmark = pytest.mark.usefixtures("aiida_profile_clean")
+
+
+def test_search_index_ranks_matches(generate_calc_job_node, search_index):
+    relax = generate_calc_job_node()
+    relax.description = "relax the silicon structure"
+    relax_twice = generate_calc_job_node()
+    relax_twice.description = "relax silicon, relax again"
+    bands = generate_calc_job_node()
+    bands.description = "silicon bands"
+    bands.base.extras.set("campaign", "bandstructures")
+    # Words found in most processes carry no weight in the ranking.
+    for description in ("phonons", "elastic constants", "magnetism", "surfaces"):
+        generate_calc_job_node().description = description
+
+    assert search_index.rebuild() == 7
+    assert len(search_index) == 7
+    assert search_index.search("relax silic") == [relax_twice.pk, relax.pk]
+    assert search_index.search("silicon structure") == [relax.pk]
+    assert search_index.search("bandstruct") == [bands.pk]
+    assert search_index.search("  ") == []
+
+
+def test_search_index_updates_incrementally(generate_calc_job_node, search_index):
+    process = generate_calc_job_node()
+    process.description = "converged"
+    # Nothing is indexed before the index is built.
+    assert not search_index.is_built
+    assert search_index.update() == 0
+    assert search_index.search("converged") == []
+
+    others = [generate_calc_job_node() for _ in range(3)]
+    search_index.rebuild()
+    assert search_index.is_built
+    assert search_index.search("converged") == [process.pk]
+
+    others[0].description = "converged"
+    assert search_index.update() >= 1
+    assert search_index.search("converged") == [process.pk, others[0].pk]
+
+
+def test_search_index_prunes_deleted_processes_range_by_range(
+    generate_calc_job_node, search_index
+):
+    processes = [generate_calc_job_node() for _ in range(4)]
+    search_index.rebuild()
+    delete_nodes([processes[0].pk, processes[3].pk], dry_run=False)
+
+    # Each update checks the next two indexed processes only.
+    search_index.update(batch_size=2)
+    assert len(search_index) == 3
+    search_index.update(batch_size=2)
+    assert len(search_index) == 2
+
+
+def test_search_index_rebuilds_offline(generate_calc_job_node, tmp_path, capsys):
+    process = generate_calc_job_node()
+    process.description = "indexed offline"
+    path = tmp_path / "offline.sqlite"
+    process_index.main(["--rebuild", "--path", str(path)])
+    assert "Indexed 1 processes" in capsys.readouterr().out
+
+    index = process_index.ProcessSearchIndex(path)
+    assert index.search("offline") == [process.pk]
+    index.close()
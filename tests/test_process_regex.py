@@ -0,0 +1,36 @@
+import pytest
+
+from home import process_regex
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("calc-42", (["calc-42"], True)),
+        (r"calc-\d+", (["calc-"], False)),
+        (r"1\.5 eV", (["1.5 eV"], True)),
+        ("foo[0-9]ba?r", (["foo", "b", "r"], False)),
+        ("x(y|z)w", (["x", "w"], False)),
+        ("a|b", (None, False)),
+        ("(?i)abc", (None, False)),
+    ],
+)
+def test_regex_literal_fragments(pattern, expected):
+    assert process_regex.regex_literal_fragments(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    ("pattern", "is_portable"),
+    [
+        (r"calc-\d+", True),
+        (r"(?:relax|scf)\.out", True),
+        (r"a{2,3}", True),
+        (r"\bcalc", False),
+        (r"(?i)calc", False),
+        (r"[\d_]", False),
+        (r"a{,3}", False),
+        (r"a{256}", False),
+    ],
+)
+def test_is_portable_regex(pattern, is_portable):
+    assert process_regex.is_portable_regex(pattern) == is_portable
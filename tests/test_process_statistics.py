@@ -0,0 +1,179 @@
+import datetime
+
+import ipywidgets as ipw
+import pytest
+from aiida import orm
+from aiida.common import timezone
+from aiida.schedulers.datastructures import JobState
+from plumpy import ProcessState
+
+from home import process as home_process
+from home import process_statistics
+
+pytestmark = pytest.mark.usefixtures("aiida_profile_clean")
+
+
+@pytest.fixture(autouse=True)
+def close_widgets():
+    """Close the widgets of a test, which stops their timers and background threads."""
+    yield
+    ipw.Widget.close_all()
+
+
+def test_count_by_falls_back_to_distinct_counts(
+    generate_calc_job_node, without_sqlalchemy_query
+):
+    for _ in range(2):
+        generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+
+    query_builder = orm.QueryBuilder().append(orm.CalcJobNode, tag="process")
+    without_sqlalchemy_query(query_builder)
+    assert process_statistics._count_by(
+        query_builder, "process", ["attributes.process_state", "attributes.exit_status"]
+    ) == {
+        "attributes.process_state": {"finished": 2},
+        "attributes.exit_status": {0: 2},
+    }
+
+
+@pytest.mark.parametrize("sqlalchemy_query", [True, False])
+def test_count_by_time(
+    generate_calc_job_node, without_sqlalchemy_query, sqlalchemy_query
+):
+    processes = [generate_calc_job_node() for _ in range(3)]
+    hour = process_statistics._truncate_time(processes[0].ctime, "hour")
+
+    query_builder = orm.QueryBuilder().append(orm.CalcJobNode, tag="process")
+    if not sqlalchemy_query:
+        without_sqlalchemy_query(query_builder)
+    counts = process_statistics._count_by_time(
+        query_builder, "process", "ctime", "hour"
+    )
+    assert sum(counts.values()) == 3
+    assert hour in counts
+    assert all(bucket.tzinfo is not None for bucket in counts)
+
+
+def _create_calcjob_node(computer, ctime):
+    node = orm.CalcJobNode(computer=computer, process_type="aiida.calculations:test")
+    node.backend_entity.bare_model.ctime = ctime
+    return node.store()
+
+
+# The test profile of AiiDA uses PostgreSQL, where the database counts with date_trunc.
+@pytest.mark.parametrize("sqlalchemy_query", [True, False])
+def test_count_by_time_buckets(
+    aiida_localhost, without_sqlalchemy_query, sqlalchemy_query
+):
+    utc = datetime.timezone.utc
+    for ctime in (
+        datetime.datetime(2024, 3, 1, 23, 59, 59, 999999, tzinfo=utc),
+        datetime.datetime(2024, 3, 2, 0, 0, tzinfo=utc),
+        # 00:30 UTC on March 2nd.
+        datetime.datetime(
+            2024, 3, 2, 2, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+        ),
+        datetime.datetime(2024, 2, 1, tzinfo=utc),
+    ):
+        _create_calcjob_node(aiida_localhost, ctime)
+
+    def count(unit):
+        query_builder = orm.QueryBuilder().append(orm.CalcJobNode, tag="process")
+        if not sqlalchemy_query:
+            without_sqlalchemy_query(query_builder)
+        since = datetime.datetime(2024, 3, 1, tzinfo=utc)
+        return process_statistics._count_by_time(
+            query_builder, "process", "ctime", unit, since
+        )
+
+    assert count("day") == {
+        datetime.datetime(2024, 3, 1, tzinfo=utc): 1,
+        datetime.datetime(2024, 3, 2, tzinfo=utc): 2,
+    }
+    assert count("hour") == {
+        datetime.datetime(2024, 3, 1, 23, tzinfo=utc): 1,
+        datetime.datetime(2024, 3, 2, 0, tzinfo=utc): 2,
+    }
+
+
+def test_find_stalled_calcjobs(generate_calc_job_node):
+    stuck, progressing, paused = (
+        generate_calc_job_node(inputs={"parameters": orm.Int(i)}) for i in range(3)
+    )
+    for job in (stuck, progressing, paused):
+        job.set_process_state(ProcessState.WAITING)
+        job.set_scheduler_state(JobState.QUEUED)
+    paused.pause()
+    generate_calc_job_node(inputs={"parameters": orm.Int(3)})
+
+    threshold = datetime.timedelta(hours=1)
+    scheduler_states = {}
+    earlier = timezone.now() - datetime.timedelta(hours=2)
+    assert (
+        process_statistics.find_stalled_calcjobs(
+            threshold, scheduler_states, now=earlier
+        )
+        == {}
+    )
+    assert set(scheduler_states) == {stuck.pk, progressing.pk, paused.pk}
+
+    # The modification times change at every check of the scheduler, stalled jobs are
+    # found by their unchanged scheduler state.
+    stuck.set_scheduler_state(JobState.QUEUED)
+    progressing.set_scheduler_state(JobState.RUNNING)
+    stalled = process_statistics.find_stalled_calcjobs(threshold, scheduler_states)
+    assert list(stalled) == [stuck.computer.label]
+    [job] = stalled[stuck.computer.label]
+    assert job["pk"] == stuck.pk
+    assert job["scheduler_state"] == JobState.QUEUED.value
+    assert job["unchanged_since"] == earlier
+
+    progressing.set_process_state(ProcessState.FINISHED)
+    process_statistics.find_stalled_calcjobs(threshold, scheduler_states)
+    assert progressing.pk not in scheduler_states
+
+
+def test_stalled_calcjobs_widget(generate_calc_job_node):
+    job = generate_calc_job_node(inputs={"parameters": orm.Int(1)})
+    job.set_process_state(ProcessState.RUNNING)
+
+    widget = process_statistics.StalledCalcJobsWidget(threshold_hours=0)
+    assert widget.update()
+    assert f"process.ipynb?id={job.pk}" in widget.output.value
+    assert not widget.update()
+
+    widget.threshold_hours.value = 24
+    widget.scan_button.click()
+    assert widget.stalled == {}
+    assert "No stalled calculation jobs." in widget.output.value
+
+
+def test_process_list_widget_throughput_bounds_buckets(aiida_localhost):
+    _create_calcjob_node(
+        aiida_localhost, timezone.now() - datetime.timedelta(days=3 * 365)
+    )
+    _create_calcjob_node(aiida_localhost, timezone.now())
+
+    widget = home_process.ProcessListWidget(past_days=-1)
+    throughput = widget.throughput
+    throughput.unit.value = "hour"
+    # The process created three years ago would add more than 26000 hourly bars.
+    assert sum(throughput.counts["created"].values()) == 1
+    # One bar, or two if the hour changed since the process was created.
+    assert throughput.chart.value.count('class="process-throughput-bucket"') <= 2
+
+
+def test_process_list_widget_throughput(generate_calc_job_node):
+    for _ in range(2):
+        generate_calc_job_node()
+    generate_calc_job_node().set_process_state(ProcessState.RUNNING)
+
+    widget = home_process.ProcessListWidget()
+    throughput = widget.throughput
+    assert sum(throughput.counts["created"].values()) == 3
+    assert sum(throughput.counts["finished"].values()) == 2
+    assert "3 created, 2 finished" in throughput.chart.value
+
+    throughput.unit.value = "hour"
+    assert sum(throughput.counts["created"].values()) == 3
+    assert not throughput.update()
@@ -0,0 +1,245 @@
+import os
+import threading
+
+import pytest
+
+from home import tail
+from home.tail import (
+    FileTail,
+    FileWatcher,
+    OutputBuffer,
+    RemoteFileTail,
+    TransportPool,
+)
+
+
+def test_file_tail_reads_appended_lines(tmp_path):
+    path = tmp_path / "aiida.out"
+    tail = FileTail(str(path))
+    assert tail.read() == []
+
+    path.write_text("first\nsec")
+    assert tail.read() == ["first\n"]
+    assert tail.read() == []
+
+    with path.open("a") as fobj:
+        fobj.write("ond\nthird\n")
+    assert tail.read() == ["second\n", "third\n"]
+    assert tail.offset == path.stat().st_size
+    assert not tail.restarted
+
+
+def test_file_tail_reads_only_appended_bytes(tmp_path, monkeypatch):
+    path = tmp_path / "aiida.out"
+    path.write_text("x" * 1000 + "\n")
+    tail = FileTail(str(path))
+    tail.read()
+
+    reads = []
+    read = tail._read
+    monkeypatch.setattr(
+        tail, "_read", lambda offset, size: reads.append(size) or read(offset, size)
+    )
+    with path.open("a") as fobj:
+        fobj.write("new\n")
+    assert tail.read() == ["new\n"]
+    assert reads == [4]
+
+
+def test_file_tail_restarts_after_truncation_and_rotation(tmp_path):
+    path = tmp_path / "aiida.out"
+    path.write_text("one\ntwo\n")
+    tail = FileTail(str(path))
+    assert tail.read() == ["one\n", "two\n"]
+
+    path.write_text("three\n")
+    assert tail.read() == ["three\n"]
+    assert tail.restarted
+
+    rotated = tmp_path / "aiida.out.new"
+    rotated.write_text("four\nfive\nsix\n")
+    os.replace(rotated, path)
+    assert tail.read() == ["four\n", "five\n", "six\n"]
+    assert tail.restarted
+    assert tail.read() == []
+    assert not tail.restarted
+
+
+def test_file_tail_replaces_undecodable_bytes(tmp_path):
+    path = tmp_path / "aiida.out"
+    path.write_bytes("énergie\n".encode("latin-1"))
+    assert FileTail(str(path)).read() == ["�nergie\n"]
+
+
+def test_file_tail_reads_at_most_max_bytes(tmp_path):
+    path = tmp_path / "aiida.out"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)))
+    tail = FileTail(str(path))
+    assert tail.read(max_bytes=20) == ["line 998\n", "line 999\n"]
+    assert tail.offset == path.stat().st_size
+
+    with path.open("a") as fobj:
+        fobj.write("line 1000\nline 1001\nline 1002\n")
+    assert tail.read(max_bytes=20) == ["line 1001\n", "line 1002\n"]
+
+
+def test_output_buffer_keeps_the_last_lines():
+    buffer = OutputBuffer(max_lines=3)
+    assert buffer.extend(["a\n", "b\n"]) == 0
+    assert buffer.extend(["c\n", "d\n"]) == 1
+    assert buffer.text() == "b\nc\nd\n"
+
+    buffer.max_lines = None
+    buffer.max_bytes = 5
+    assert buffer.trim() == 1
+    assert list(buffer) == ["c\n", "d\n"]
+    assert buffer.extend(["é\n"]) == 1
+    assert buffer.size == 5
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.size == 0
+
+
+@pytest.mark.parametrize("inotify", [True, False])
+def test_file_watcher_calls_back_on_changes(tmp_path, monkeypatch, inotify):
+    if not inotify:
+        monkeypatch.setattr(tail, "_inotify_watch", lambda _: None)
+    path = tmp_path / "aiida.out"
+    changed = threading.Event()
+    watcher = FileWatcher(str(path), changed.set, poll_interval=0.01)
+    assert watcher.start() is inotify
+    assert watcher.start() is inotify
+
+    (tmp_path / "other.out").write_text("unrelated\n")
+    assert not changed.wait(0.1)
+    path.write_text("written\n")
+    assert changed.wait(5)
+    watcher.stop()
+    assert not watcher.is_running
+
+
+def test_file_watcher_stops_from_callback(tmp_path):
+    path = tmp_path / "aiida.out"
+    watcher = FileWatcher(str(path), callback=None)
+    watcher.callback = watcher.stop
+    watcher.start()
+    thread = watcher._thread
+    path.write_text("written\n")
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_remote_file_tail_reads_through_transport(aiida_localhost, tmp_path):
+    path = tmp_path / "aiida out"
+    pool = TransportPool()
+    remote = RemoteFileTail(str(path), aiida_localhost, pool=pool)
+    assert remote.read() == []
+
+    path.write_text("first\nsec")
+    assert remote.read() == ["first\n"]
+    with path.open("a") as fobj:
+        fobj.write("ond\n")
+    assert remote.read() == ["second\n"]
+
+    rotated = tmp_path / "rotated"
+    rotated.write_text("third\n")
+    os.replace(rotated, path)
+    assert remote.read() == ["third\n"]
+    assert remote.restarted
+    pool.close()
+
+
+class _FakeTransport:
+    def __init__(self, safe_interval, error=None, ls_output=""):
+        self.safe_interval = safe_interval
+        self.error = error
+        self.ls_output = ls_output
+        self.is_open = False
+        self.opened = 0
+
+    def get_safe_open_interval(self):
+        return self.safe_interval
+
+    def open(self):
+        if self.error is not None:
+            raise self.error
+        self.is_open = True
+        self.opened += 1
+
+    def close(self):
+        if self.error is not None:
+            raise self.error
+        self.is_open = False
+
+    def exec_command_wait(self, _command):
+        return 0, self.ls_output, ""
+
+
+class _FakeComputer:
+    uuid = "computer"
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def get_transport(self):
+        return self.transport
+
+
+def test_transport_pool_reuses_transports_within_safe_interval():
+    transport = _FakeTransport(safe_interval=60)
+    computer = _FakeComputer(transport)
+    pool = TransportPool()
+
+    with pool.request(computer) as used:
+        assert used is transport
+        with pool.request(computer) as busy:
+            assert busy is None
+    with pool.request(computer) as too_soon:
+        assert too_soon is None
+
+    transport.safe_interval = 0
+    with pool.request(computer) as used:
+        assert used is transport
+    assert transport.opened == 1
+    assert transport.is_open
+
+    with pytest.raises(RuntimeError), pool.request(computer):
+        raise RuntimeError
+    assert not transport.is_open
+    with pool.request(computer):
+        pass
+    assert transport.opened == 2
+
+    pool.close()
+    assert not transport.is_open
+
+
+def test_transport_pool_raises_transport_errors():
+    transport = _FakeTransport(safe_interval=0, error=OSError("Connection refused"))
+    computer = _FakeComputer(transport)
+    pool = TransportPool()
+    remote = RemoteFileTail("aiida.out", computer, pool=pool)
+
+    with pytest.raises(OSError, match="Connection refused"):
+        remote.read()
+    transport.error = None
+    # The connection drops, and closing the transport fails as well.
+    with pytest.raises(EOFError), pool.request(computer) as used:
+        assert used is transport
+        transport.error = OSError("Connection reset")
+        raise EOFError
+    computer.transport = _FakeTransport(safe_interval=0)
+    with pool.request(computer) as used:
+        assert used is computer.transport
+    assert computer.transport.opened == 1
+    pool.close()
+
+
+@pytest.mark.parametrize("ls_output", ["", "total 0", "inode -rw-r--r-- 1 a b size"])
+def test_remote_file_tail_ignores_unexpected_ls_output(ls_output):
+    computer = _FakeComputer(_FakeTransport(safe_interval=0, ls_output=ls_output))
+    pool = TransportPool()
+    remote = RemoteFileTail("aiida.out", computer, pool=pool)
+    assert remote.read() == []
+    pool.close()
@@ -0,0 +1,97 @@
+import threading
+
+import ipywidgets as ipw
+import pytest
+
+from home.widgets import AutoupdateScheduler, AutoupdateWidgetMixin, LogViewWidget
+
+
+def test_log_view_widget_sends_appended_lines(monkeypatch):
+    widget = LogViewWidget(max_lines=3)
+    sent = []
+    monkeypatch.setattr(widget, "send", sent.append)
+
+    widget.write_lines(["one\n", "two\n"])
+    assert sent.pop() == {"type": "reset", "text": "one\ntwo\n"}
+    widget.write_lines([])
+    assert not sent
+
+    widget.write_lines(["three\n", "four\n"])
+    assert sent.pop() == {"type": "append", "text": "three\nfour\n", "drop": 1}
+    widget.write_lines(["five\n", "six\n", "seven\n"])
+    assert sent.pop() == {"type": "reset", "text": "five\nsix\nseven\n"}
+
+    widget._handle_message(widget, {"type": "snapshot"}, [])
+    assert sent.pop() == {"type": "reset", "text": "five\nsix\nseven\n"}
+
+    widget.max_bytes = 6
+    assert sent.pop() == {"type": "reset", "text": "seven\n"}
+
+    widget.clear()
+    assert sent.pop() == {"type": "reset", "text": ""}
+    assert widget.value == ""
+
+
+def test_autoupdate_scheduler_backs_off_while_idle():
+    changes = [True, False, False, False]
+    calls = threading.Semaphore(0)
+
+    def callback():
+        calls.release()
+        return changes.pop(0) if changes else False
+
+    scheduler = AutoupdateScheduler(callback, interval=0.01, max_interval=0.03)
+    scheduler.start()
+    scheduler.start()  # Starting twice does not start a second thread.
+    try:
+        for _ in range(4):
+            assert calls.acquire(timeout=5)
+        assert scheduler.current_interval == pytest.approx(0.03)
+
+        scheduler.pause()
+        assert scheduler.is_paused
+        scheduler.resume()
+        assert calls.acquire(timeout=5)
+    finally:
+        scheduler.stop()
+    assert not scheduler.is_running
+
+
+def test_autoupdate_scheduler_keeps_running_after_errors():
+    calls = threading.Semaphore(0)
+    errors = [ValueError("failed once")]
+
+    def callback():
+        calls.release()
+        if errors:
+            raise errors.pop()
+        return False
+
+    scheduler = AutoupdateScheduler(callback, interval=0.01)
+    with pytest.warns(UserWarning, match="failed once"):
+        scheduler.start()
+        try:
+            for _ in range(2):
+                assert calls.acquire(timeout=5)
+            assert scheduler.is_running
+        finally:
+            scheduler.stop()
+
+
+class _CountingWidget(AutoupdateWidgetMixin, ipw.HTML):
+    def __init__(self, **kwargs):
+        self.calls = threading.Semaphore(0)
+        super().__init__(**kwargs)
+
+    def update(self):
+        self.calls.release()
+        return False
+
+
+def test_autoupdate_widget_mixin_stops_on_close():
+    widget = _CountingWidget()
+    widget.autoupdate.start(interval=0.01)
+    assert widget.calls.acquire(timeout=5)
+
+    widget.close()
+    assert not widget.autoupdate.is_running